@@ -1,8 +1,38 @@
+from collections import Counter
 from typing import Dict, Any, List
 import re
+import ahocorasick
 from loguru import logger
 
 
+# Common words excluded from extracted keywords
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
+    "for", "of", "with", "by", "from", "is", "are", "was", "were"
+})
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Words containing any of these are ranked first by extract_keywords
+_CRYPTO_TERM_RE = re.compile(r'crypto|token|coin|blockchain|defi')
+
+
+def _build_automaton(category_keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """
+    Build one Aho-Corasick automaton mapping every keyword to its category
+    
+    Each keyword's value is (category, keyword, length - 1) so a match's
+    start offset can be recovered from its end index without recomputing
+    the keyword length per match.
+    """
+    automaton = ahocorasick.Automaton()
+    for category, keywords in category_keywords.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, (category, keyword, len(keyword) - 1))
+    automaton.make_automaton()
+    return automaton
+
+
 class CategorizerAgent:
     """Agent for categorizing crypto news and social media updates"""
     
@@ -31,44 +61,41 @@ class CategorizerAgent:
         ]
     }
     
+    # Built once at class load; scores every keyword in a single pass over the text
+    _automaton = _build_automaton(CATEGORY_KEYWORDS)
+    
     @classmethod
     def categorize_item(cls, item: Dict[str, Any]) -> str:
         """Categorize a single item based on content"""
-        text = ""
-        
         # Extract text content
-        if "title" in item:
-            text += item["title"].lower() + " "
-        if "content" in item:
-            text += item["content"].lower() + " "
-        if "text" in item:
-            text += item["text"].lower() + " "
+        text = " ".join(
+            item[field] for field in ("title", "content", "text") if item.get(field)
+        ).lower()
         
-        # Score each category
-        category_scores = {}
-        for category, keywords in cls.CATEGORY_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            category_scores[category] = score
+        # Keywords must start on a word boundary so short terms like "ai" or
+        # "dex" don't fire inside "said" or "index"; suffixes ("agents") still match
+        matched = set()
+        for end, match in cls._automaton.iter(text):
+            start = end - match[2]
+            if start == 0 or not text[start - 1].isalnum():
+                matched.add(match)
         
-        # Return category with highest score, default to trends
-        if max(category_scores.values()) > 0:
-            return max(category_scores, key=category_scores.get)
+        if not matched:
+            return "trends"  # Default category
         
-        return "trends"  # Default category
+        # Score each category (each keyword counts once) and return the
+        # highest, ties going to the category listed first
+        category_scores = Counter(category for category, _, _ in matched)
+        return max(cls.CATEGORY_KEYWORDS, key=category_scores.__getitem__)
     
     @classmethod
     def categorize_items(cls, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Categorize multiple items into buckets"""
-        categorized = {
-            "trends": [],
-            "liquidity": [],
-            "agents": [],
-            "macro_events": [],
-            "proof_of_work": []
-        }
+        categorized = {category: [] for category in cls.CATEGORY_KEYWORDS}
         
+        categorize = cls.categorize_item
         for item in items:
-            category = cls.categorize_item(item)
+            category = categorize(item)
             item["category"] = category
             categorized[category].append(item)
         
@@ -80,26 +107,23 @@ class CategorizerAgent:
     @classmethod
     def extract_keywords(cls, text: str, limit: int = 10) -> List[str]:
         """Extract key terms from text for search"""
-        # Remove common words
-        stop_words = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
-            "for", "of", "with", "by", "from", "is", "are", "was", "were"
-        }
-        
-        # Clean and split
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [w for w in words if w not in stop_words and len(w) > 3]
-        
         # Get unique keywords, prioritize crypto terms
         crypto_terms = []
         other_terms = []
+        seen = set()
         
-        for word in keywords:
-            if any(term in word for term in ["crypto", "token", "coin", "blockchain", "defi"]):
+        for word in _WORD_RE.findall(text.lower()):
+            # Skip common and short words
+            if len(word) <= 3 or word in _STOP_WORDS or word in seen:
+                continue
+            seen.add(word)
+            
+            if _CRYPTO_TERM_RE.search(word):
                 crypto_terms.append(word)
+                if len(crypto_terms) == limit:
+                    break  # Crypto terms alone fill the result
             else:
                 other_terms.append(word)
         
         # Return crypto terms first, then others
-        unique_keywords = list(dict.fromkeys(crypto_terms + other_terms))
-        return unique_keywords[:limit]
\ No newline at end of file
+        return (crypto_terms + other_terms)[:limit]
@@ -1,7 +1,34 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TypedDict
+from datetime import timezone
 from app.agents.date_normalizer import DateNormalizerAgent
 from app.agents.categorizer import CategorizerAgent
 from loguru import logger
+import uuid
+
+
+class Signal(TypedDict):
+    """Shape of a signal item, matching the SignalItem model columns"""
+    id: str
+    signal: str
+    sentiment: str
+    sentiment_value: float
+    timestamp: float
+    feed_categories: List[str]
+    short_context: str
+    long_context: str
+    sources: List[str]
+    author: Optional[str]
+    tokens: List[str]
+    tweet_url: Optional[str]
+    narrative_id: str
+
+
+# CryptoNews sentiment label -> (signal sentiment, sentiment_value)
+_SENTIMENTS = {
+    "positive": ("bullish", 0.75),
+    "negative": ("bearish", 0.25),
+}
+_NEUTRAL = ("neutral", 0.5)
 
 
 class DataMergerAgent:
@@ -61,23 +88,17 @@ class DataMergerAgent:
     ) -> Dict[str, Any]:
         """Merge feeds for a specific category"""
         
-        # Normalize dates
-        normalized_news = [
-            DateNormalizerAgent.normalize_item(item) for item in news_items
-        ]
-        normalized_tweets = [
-            DateNormalizerAgent.normalize_item(item) for item in tweets
-        ]
+        news_filtered = []
+        tweets_filtered = []
         
-        # Filter by category
-        news_filtered = [
-            item for item in normalized_news 
-            if CategorizerAgent.categorize_item(item) == category
-        ]
-        tweets_filtered = [
-            item for item in normalized_tweets 
-            if CategorizerAgent.categorize_item(item) == category
-        ]
+        # Categorize once and only normalize (copy + date parse) the matches
+        for source_items, filtered in ((news_items, news_filtered), (tweets, tweets_filtered)):
+            for item in source_items:
+                if CategorizerAgent.categorize_item(item) != category:
+                    continue
+                normalized = DateNormalizerAgent.normalize_item(item)
+                normalized["category"] = category
+                filtered.append(normalized)
         
         # Combine and sort
         all_items = news_filtered + tweets_filtered
@@ -92,39 +113,117 @@ class DataMergerAgent:
             "timestamp": DateNormalizerAgent.normalize_date("now").isoformat()
         }
     
+    @staticmethod
+    def deduplicate(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop repeated items, keyed by normalized URL or else title/text"""
+        seen = set()
+        unique = []
+        
+        for item in items:
+            key = (item.get("url") or "").rstrip("/").lower() or item.get("title") or item.get("text")
+            if key:
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(item)
+        
+        return unique
+    
+    @staticmethod
+    def _signal_id(key: str) -> str:
+        """Stable UUID for a source item, so re-fetched items map to the same row"""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+    
+    @staticmethod
+    def _timestamp(date_value: Any) -> float:
+        """Unix timestamp for a raw source date"""
+        return DateNormalizerAgent.normalize_date(date_value).replace(tzinfo=timezone.utc).timestamp()
+    
+    @classmethod
+    def _transform_news_to_signal(cls, item: Dict[str, Any]) -> Optional[Signal]:
+        """Convert a CryptoNews item to the SignalItem shape"""
+        title = item.get("title")
+        if not title:
+            return None
+        
+        url = item.get("url", "")
+        content = item.get("content", "")
+        sentiment, sentiment_value = _SENTIMENTS.get((item.get("sentiment") or "").lower(), _NEUTRAL)
+        
+        return {
+            "id": cls._signal_id(url or title),
+            "signal": title,
+            "sentiment": sentiment,
+            "sentiment_value": sentiment_value,
+            "timestamp": cls._timestamp(item.get("published_at")),
+            "feed_categories": [CategorizerAgent.categorize_item(item)],
+            "short_context": content[:280],
+            "long_context": content,
+            "sources": [url] if url else [],
+            "author": item.get("source_name"),
+            "tokens": [f"${ticker}" for ticker in item.get("tickers", [])],
+            "tweet_url": None,
+            "narrative_id": "None"
+        }
+    
+    @classmethod
+    def _transform_tweet_to_signal(cls, item: Dict[str, Any]) -> Optional[Signal]:
+        """Convert a normalized tweet to the SignalItem shape"""
+        text = item.get("text")
+        if not text:
+            return None
+        
+        url = item.get("url", "")
+        cashtags = (item.get("entities") or {}).get("cashtags", [])
+        
+        return {
+            "id": cls._signal_id(url or f"tweet:{item.get('id') or text}"),
+            "signal": text,
+            "sentiment": _NEUTRAL[0],
+            "sentiment_value": _NEUTRAL[1],
+            "timestamp": cls._timestamp(item.get("created_at")),
+            "feed_categories": [CategorizerAgent.categorize_item(item)],
+            "short_context": text[:280],
+            "long_context": text,
+            "sources": [url] if url else [],
+            "author": item.get("username"),
+            "tokens": [f"${tag['tag']}" for tag in cashtags if tag.get("tag")],
+            "tweet_url": url or None,
+            "narrative_id": "None"
+        }
+    
     @staticmethod
     def _format_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format items for API response"""
         formatted = []
+        append = formatted.append
         
         for item in items:
+            get = item.get
+            source = get("source")
             formatted_item = {
-                "source": item.get("source"),
-                "published_at": item.get("normalized_date").isoformat(),
-                "url": item.get("url", "")
+                "source": source,
+                "published_at": get("normalized_date").isoformat(),
+                "url": get("url", "")
             }
             
             # Add source-specific fields
-            if item.get("source") == "cryptonews":
-                formatted_item.update({
-                    "title": item.get("title"),
-                    "content": item.get("content", "")[:500],  # Truncate content
-                    "source_name": item.get("source_name"),
-                    "sentiment": item.get("sentiment"),
-                    "image_url": item.get("image_url")
-                })
-            elif item.get("source") == "twitter":
-                formatted_item.update({
-                    "text": item.get("text"),
-                    "username": item.get("username"),
-                    "author": item.get("author"),
-                    "engagement": {
-                        "likes": item.get("like_count", 0),
-                        "retweets": item.get("retweet_count", 0),
-                        "replies": item.get("reply_count", 0)
-                    }
-                })
+            if source == "cryptonews":
+                formatted_item["title"] = get("title")
+                formatted_item["content"] = get("content", "")[:500]  # Truncate content
+                formatted_item["source_name"] = get("source_name")
+                formatted_item["sentiment"] = get("sentiment")
+                formatted_item["image_url"] = get("image_url")
+            elif source == "twitter":
+                formatted_item["text"] = get("text")
+                formatted_item["username"] = get("username")
+                formatted_item["author"] = get("author")
+                formatted_item["engagement"] = {
+                    "likes": get("like_count", 0),
+                    "retweets": get("retweet_count", 0),
+                    "replies": get("reply_count", 0)
+                }
             
-            formatted.append(formatted_item)
+            append(formatted_item)
         
-        return formatted
\ No newline at end of file
+        return formatted
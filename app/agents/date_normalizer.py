@@ -1,16 +1,48 @@
-from datetime import datetime
-from typing import Any, Dict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from dateutil import parser
 from loguru import logger
 
 
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert aware datetimes to naive UTC so every normalized date is comparable"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_value: str) -> Optional[datetime]:
+    """Parse a date string, returning None if no parser accepts it"""
+    # Try ISO format first (C parser, accepts "Z" since Python 3.11)
+    try:
+        return _to_naive_utc(datetime.fromisoformat(date_value))
+    except ValueError:
+        pass
+    
+    # RFC 2822 dates, e.g. "Mon, 17 Nov 2025 10:30:00 -0500"
+    if "," in date_value:
+        try:
+            return _to_naive_utc(parsedate_to_datetime(date_value))
+        except (TypeError, ValueError):
+            pass
+    
+    # Try general parser (slow, last resort)
+    try:
+        return _to_naive_utc(parser.parse(date_value))
+    except (ValueError, OverflowError):
+        return None
+
+
 class DateNormalizerAgent:
     """Agent for extracting and normalizing dates from various sources"""
     
     @staticmethod
     def normalize_date(date_value: Any) -> datetime:
         """
-        Normalize various date formats to datetime object
+        Normalize various date formats to a naive UTC datetime object
         Handles:
         - ISO format strings
         - Unix timestamps
@@ -20,25 +52,17 @@ class DateNormalizerAgent:
         try:
             # If already datetime
             if isinstance(date_value, datetime):
-                return date_value
+                return _to_naive_utc(date_value)
             
             # If Unix timestamp
             if isinstance(date_value, (int, float)):
-                return datetime.fromtimestamp(date_value)
+                return datetime.fromtimestamp(date_value, tz=timezone.utc).replace(tzinfo=None)
             
-            # If string, try parsing
+            # If string, parse (memoized, feeds repeat the same timestamps)
             if isinstance(date_value, str):
-                # Try ISO format first
-                try:
-                    return datetime.fromisoformat(date_value.replace('Z', '+00:00'))
-                except:
-                    pass
-                
-                # Try general parser
-                try:
-                    return parser.parse(date_value)
-                except:
-                    pass
+                parsed = _parse_date_string(date_value)
+                if parsed is not None:
+                    return parsed
             
             # Default to current time if all fails
             logger.warning(f"Could not parse date: {date_value}, using current time")
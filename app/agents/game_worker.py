@@ -3,7 +3,9 @@ GAME X Worker Agent using official GAME SDK
 This is the main agent that coordinates crypto news aggregation
 """
 
+import asyncio
 import logging
+from collections import Counter
 from typing import Dict, Any, Tuple
 from datetime import datetime
 from game_sdk.game.worker import Worker
@@ -12,6 +14,7 @@ from app.services.cryptonews import crypto_news_service
 from app.services.game_x import game_x_service
 from app.agents.date_normalizer import DateNormalizerAgent
 from app.agents.categorizer import CategorizerAgent
+from app.agents.data_merger import DataMergerAgent
 from app.core.config import settings
 from loguru import logger
 
@@ -159,23 +162,21 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
         try:
             logger.info(f"Merging feeds: limit={limit}, category={category}")
             
-            # Fetch from both sources
-            crypto_news = await crypto_news_service.fetch_trending_news(limit=limit)
-            twitter_feed = await game_x_service.fetch_latest_tweets(max_results=limit)
+            # Fetch from both sources concurrently; a failing source yields no items
+            crypto_news, twitter_feed = await asyncio.gather(
+                crypto_news_service.fetch_trending_news(limit=limit),
+                game_x_service.fetch_latest_tweets(max_results=limit),
+                return_exceptions=True
+            )
+            if isinstance(crypto_news, Exception):
+                logger.error(f"❌ Error fetching news: {crypto_news}")
+                crypto_news = []
+            if isinstance(twitter_feed, Exception):
+                logger.error(f"❌ Error fetching tweets: {twitter_feed}")
+                twitter_feed = []
             
             logger.info(f"📰 Fetched {len(crypto_news)} news articles and {len(twitter_feed)} tweets")
             
-            # Normalize dates for all items
-            for item in crypto_news:
-                item["normalized_date"] = DateNormalizerAgent.normalize_date(
-                    item.get("published_at") or item.get("date")
-                )
-            
-            for item in twitter_feed:
-                item["normalized_date"] = DateNormalizerAgent.normalize_date(
-                    item.get("created_at") or item.get("date")
-                )
-            
             # Filter valid items
             valid_crypto_news = [
                 item for item in crypto_news 
@@ -188,11 +189,14 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
             
             logger.info(f"✅ Valid items: {len(valid_crypto_news)} news, {len(valid_twitter_feed)} tweets")
             
-            # Combine items
-            combined = valid_crypto_news + valid_twitter_feed
+            # Combine and deduplicate items
+            combined = DataMergerAgent.deduplicate(valid_crypto_news + valid_twitter_feed)
             
-            # Categorize items
+            # Normalize dates and categorize in a single pass
             for item in combined:
+                item["normalized_date"] = DateNormalizerAgent.normalize_date(
+                    item.get("published_at") or item.get("created_at") or item.get("date")
+                )
                 item["category"] = CategorizerAgent.categorize_item(item)
             
             # Filter by category if specified
@@ -201,18 +205,15 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
                 logger.info(f"🔍 Filtered to {len(combined)} items in category: {category}")
             
             # Sort by normalized date (newest first)
-            combined = sorted(
-                combined,
-                key=lambda x: x.get("normalized_date", "1970-01-01T00:00:00Z"),
-                reverse=True
-            )
+            combined = DateNormalizerAgent.sort_by_date(combined)
             
             # Build response
+            source_counts = Counter(item.get("source") for item in combined)
             result = {
                 "combined": combined,
                 "total_items": len(combined),
-                "news_count": len([i for i in combined if i.get("source") == "cryptonews"]),
-                "tweets_count": len([i for i in combined if i.get("source") == "twitter"]),
+                "news_count": source_counts["cryptonews"],
+                "tweets_count": source_counts["twitter"],
                 "category": category or "all",
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
@@ -243,8 +244,18 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
         try:
             logger.info(f"🔍 Searching for keywords: {', '.join(keywords)}")
             
-            # Fetch news
-            crypto_news = await crypto_news_service.fetch_latest_news(limit=50)
+            # Fetch news and search tweets concurrently
+            crypto_news, tweets = await asyncio.gather(
+                crypto_news_service.fetch_latest_news(limit=50),
+                game_x_service.search_tweets_by_keywords(keywords, max_results=limit),
+                return_exceptions=True
+            )
+            if isinstance(crypto_news, Exception):
+                logger.error(f"❌ Error fetching news: {crypto_news}")
+                crypto_news = []
+            if isinstance(tweets, Exception):
+                logger.error(f"❌ Error searching tweets: {tweets}")
+                tweets = []
             
             # Filter news by keywords
             filtered_news = []
@@ -253,11 +264,8 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
                 if any(keyword.lower() in text for keyword in keywords):
                     filtered_news.append(item)
             
-            # Search tweets
-            tweets = await game_x_service.search_tweets_by_keywords(keywords, max_results=limit)
-            
-            # Combine and process
-            combined = filtered_news + tweets
+            # Combine, deduplicate and process
+            combined = DataMergerAgent.deduplicate(filtered_news + tweets)
             
             for item in combined:
                 item["normalized_date"] = DateNormalizerAgent.normalize_date(
@@ -266,11 +274,7 @@ categorized, deduplicated, and up-to-date feed of crypto-related content.
                 item["category"] = CategorizerAgent.categorize_item(item)
             
             # Sort by date
-            combined = sorted(
-                combined,
-                key=lambda x: x.get("normalized_date", "1970-01-01T00:00:00Z"),
-                reverse=True
-            )[:limit]
+            combined = DateNormalizerAgent.sort_by_date(combined)[:limit]
             
             result = {
                 "combined": combined,
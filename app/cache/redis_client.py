@@ -1,79 +1,262 @@
-import redis
-import json
-from typing import Optional, Any
+import secrets
+import orjson
+import zstandard
+from typing import Optional, Any, Dict, List
+from cachetools import TTLCache
+from redis.asyncio import ConnectionPool, Redis
 from app.core.config import settings
 from loguru import logger
 
+# Delete a lock only while it still holds the caller's token, so a holder whose
+# lock already expired can't release one another process has since taken
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class RedisClient:
+    # 1-byte format tag prefixed to every stored value
+    FORMAT_JSON = b"\x00"
+    FORMAT_ZSTD_JSON = b"\x01"
+    
+    # Payloads below this size are stored uncompressed
+    COMPRESS_MIN_BYTES = 1024
+    
+    _compressor = zstandard.ZstdCompressor(level=3)
+    _decompressor = zstandard.ZstdDecompressor()
+    
     def __init__(self):
-        self.client: Optional[redis.Redis] = None
+        self.pool: Optional[ConnectionPool] = None
+        self.client: Optional[Redis] = None
+        self._release_lock_script = None
         self.ttl = settings.REDIS_TTL
+        # Short-lived in-process copy of hot keys, holds already-decoded values
+        self.local_cache: TTLCache = TTLCache(maxsize=1024, ttl=min(30, self.ttl))
+        # Same, but holding the JSON bytes for responses served without decoding
+        self.local_raw_cache: TTLCache = TTLCache(maxsize=1024, ttl=min(30, self.ttl))
     
     async def connect(self):
-        """Initialize Redis connection"""
+        """Initialize Redis connection pool"""
         try:
-            self.client = redis.from_url(
+            self.pool = ConnectionPool.from_url(
                 settings.REDIS_URL,
-                decode_responses=True,
+                decode_responses=False,  # orjson reads and writes bytes directly
                 socket_connect_timeout=5
             )
-            self.client.ping()
+            self.client = Redis(connection_pool=self.pool)
+            # Runs via EVALSHA, so the script body is sent only once
+            self._release_lock_script = self.client.register_script(_RELEASE_LOCK_SCRIPT)
+            await self.client.ping()
             logger.info("✓ Redis connection established successfully")
             return True
         except Exception as e:
             logger.error(f"✗ Redis connection failed: {str(e)}")
             return False
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache, checking the in-process cache before Redis"""
         try:
+            cached = self.local_cache.get(key)
+            if cached is not None:
+                return cached
             if not self.client:
                 return None
-            value = self.client.get(key)
+            value = await self.client.get(key)
             if value:
-                return json.loads(value)
+                decoded = orjson.loads(self._unpack(value))
+                self.local_cache[key] = decoded
+                return decoded
             return None
         except Exception as e:
             logger.error(f"Redis GET error for key {key}: {str(e)}")
             return None
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Get the stored JSON bytes for a key without decoding them"""
+        try:
+            cached = self.local_raw_cache.get(key)
+            if cached is not None:
+                return cached
+            if not self.client:
+                return None
+            value = await self.client.get(key)
+            if value:
+                raw = self._unpack(value)
+                self.local_raw_cache[key] = raw
+                return raw
+            return None
+        except Exception as e:
+            logger.error(f"Redis GET error for key {key}: {str(e)}")
+            return None
+    
+    async def exists(self, key: str) -> bool:
+        """
+        Check Redis for a key, bypassing the in-process cache
+        
+        For keys whose deletion must take effect across workers at once,
+        such as payment verifications.
+        """
+        try:
+            if not self.client:
+                return False
+            return bool(await self.client.exists(key))
+        except Exception as e:
+            logger.error(f"Redis EXISTS error for key {key}: {str(e)}")
+            return False
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache with TTL"""
         try:
             if not self.client:
                 return False
-            serialized = json.dumps(value, default=str)
             expire_time = ttl or self.ttl
-            self.client.setex(key, expire_time, serialized)
+            await self.client.setex(key, expire_time, self._serialize(value))
+            self._evict_local(key)
             return True
         except Exception as e:
             logger.error(f"Redis SET error for key {key}: {str(e)}")
             return False
     
-    def delete(self, key: str) -> bool:
+    async def mget(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """Get several values in one pipelined round-trip, keyed by cache key"""
+        results: Dict[str, Optional[Any]] = {key: self.local_cache.get(key) for key in keys}
+        missing = [key for key, value in results.items() if value is None]
+        try:
+            if not missing or not self.client:
+                return results
+            pipe = self.client.pipeline(transaction=False)
+            for key in missing:
+                pipe.get(key)
+            for key, value in zip(missing, await pipe.execute()):
+                if value:
+                    decoded = orjson.loads(self._unpack(value))
+                    self.local_cache[key] = decoded
+                    results[key] = decoded
+            return results
+        except Exception as e:
+            logger.error(f"Redis MGET error for keys {', '.join(missing)}: {str(e)}")
+            return results
+    
+    async def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values with TTL in one pipelined round-trip"""
+        try:
+            if not self.client:
+                return False
+            expire_time = ttl or self.ttl
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, expire_time, self._serialize(value))
+            await pipe.execute()
+            for key in mapping:
+                self._evict_local(key)
+            return True
+        except Exception as e:
+            logger.error(f"Redis MSET error for keys {', '.join(mapping)}: {str(e)}")
+            return False
+    
+    async def acquire_lock(self, key: str, ttl: int = 10) -> Optional[str]:
+        """
+        Try to take a short-lived cross-process lock (SET NX EX)
+        
+        Returns the lock's random token when it was taken, or when Redis is
+        unavailable and there is nothing to coordinate with; None otherwise.
+        Pass the token to release_lock.
+        """
+        token = secrets.token_hex(16)
+        try:
+            if not self.client:
+                return token
+            if await self.client.set(key, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            logger.error(f"Redis LOCK error for key {key}: {str(e)}")
+            return token
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with acquire_lock, if it is still ours"""
+        try:
+            if not self.client:
+                return False
+            return bool(await self._release_lock_script(keys=[key], args=[token]))
+        except Exception as e:
+            logger.error(f"Redis UNLOCK error for key {key}: {str(e)}")
+            return False
+    
+    async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         try:
             if not self.client:
                 return False
-            self.client.delete(key)
+            await self.client.delete(key)
+            self._evict_local(key)
             return True
         except Exception as e:
             logger.error(f"Redis DELETE error for key {key}: {str(e)}")
             return False
     
-    def clear_pattern(self, pattern: str) -> bool:
-        """Clear all keys matching pattern"""
+    async def clear_pattern(self, pattern: str, batch_size: int = 500) -> bool:
+        """
+        Clear all keys matching pattern
+        
+        Keys are found with incremental SCAN and removed with UNLINK in
+        batches, so Redis never blocks on a full keyspace walk and memory
+        is reclaimed in the background. This is not atomic: keys written
+        while the scan is running may survive the clear.
+        """
         try:
             if not self.client:
                 return False
-            keys = self.client.keys(pattern)
-            if keys:
-                self.client.delete(*keys)
+            batch = []
+            async for key in self.client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    # Sent as each batch fills, so no request grows with the match set
+                    await self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                await self.client.unlink(*batch)
+            self.local_cache.clear()
+            self.local_raw_cache.clear()
             return True
         except Exception as e:
             logger.error(f"Redis CLEAR error for pattern {pattern}: {str(e)}")
             return False
+    
+    def _evict_local(self, key: str):
+        """Drop a key from both in-process caches"""
+        self.local_cache.pop(key, None)
+        self.local_raw_cache.pop(key, None)
+    
+    def _serialize(self, value: Any) -> bytes:
+        """Encode a value to its stored (tagged, maybe compressed) form"""
+        return self._pack(orjson.dumps(value, default=str, option=orjson.OPT_NAIVE_UTC))
+    
+    def _pack(self, payload: bytes) -> bytes:
+        """Tag a JSON payload, compressing it with zstd when large enough"""
+        if len(payload) < self.COMPRESS_MIN_BYTES:
+            return self.FORMAT_JSON + payload
+        return self.FORMAT_ZSTD_JSON + self._compressor.compress(payload)
+    
+    def _unpack(self, value: bytes) -> bytes:
+        """Return the JSON payload of a stored value"""
+        tag = value[:1]
+        if tag == self.FORMAT_ZSTD_JSON:
+            return self._decompressor.decompress(value[1:])
+        if tag == self.FORMAT_JSON:
+            return value[1:]
+        # Untagged values written before compression was introduced
+        return value
+    
+    async def close(self):
+        """Close Redis connections"""
+        if self.client:
+            await self.client.aclose()
+        if self.pool:
+            await self.pool.disconnect()
 
 
-redis_client = RedisClient()
\ No newline at end of file
+redis_client = RedisClient()
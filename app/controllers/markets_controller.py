@@ -2,243 +2,342 @@
 Controller for handling market endpoints
 """
 
-from typing import Dict, Any
+from dataclasses import dataclass
+from functools import partial
+from heapq import nlargest
+from operator import itemgetter
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, Union
+from fastapi import Response
 from app.services.cryptonews import crypto_news_service
 from app.services.game_x import game_x_service
-from app.agents.data_merger import DataMergerAgent
+from app.agents.data_merger import DataMergerAgent, Signal
 from app.cache.redis_client import redis_client
-from app.queue.tasks import save_signal_items, save_category_feed
+from app.queue.batcher import write_batcher
 from loguru import logger
+import asyncio
+import re
 import time
 
 
+_POW_KEYWORDS = ["mining", "hashrate", "miner", "pow", "difficulty", "asic"]
+# One regex pass per signal instead of a substring scan per keyword
+_POW_RE = re.compile("|".join(map(re.escape, _POW_KEYWORDS)), re.IGNORECASE)
+
+_MAX_ITEMS = 50
+_CACHE_TTL = 3600
+_STALE_TTL = 24 * 3600  # last-good copy served when upstream returns nothing
+_EMPTY_TTL = 60
+
+# Per-key rebuild locks (in-process) and the cross-worker Redis lock timings
+_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+_LOCK_TTL = 10
+_LOCK_WAIT = 1.0
+
+
+async def _fetch_sources(news_coro, tweets_coro) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Fetch news and tweets concurrently; a failing source yields no items"""
+    news, tweets = await asyncio.gather(news_coro, tweets_coro, return_exceptions=True)
+    if isinstance(news, Exception):
+        logger.error(f"Error fetching news: {str(news)}")
+        news = []
+    if isinstance(tweets, Exception):
+        logger.error(f"Error fetching tweets: {str(tweets)}")
+        tweets = []
+    return news, tweets
+
+
+def _merge_category(
+    category: str,
+    news: List[Dict[str, Any]],
+    tweets: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Items for one categorizer category, newest first"""
+    return DataMergerAgent.merge_by_category(category, news, tweets)["items"]
+
+
+def _pow_signals(news: List[Dict[str, Any]], tweets: List[Dict[str, Any]]) -> List[Signal]:
+    """Newest mining-related signals, at most _MAX_ITEMS"""
+    # Skip items repeated across sources
+    all_items = DataMergerAgent.deduplicate(news + tweets)
+    signals: List[Signal] = []
+    
+    for item in all_items:
+        if item.get("source") == "cryptonews":
+            signal = DataMergerAgent._transform_news_to_signal(item)
+        else:
+            signal = DataMergerAgent._transform_tweet_to_signal(item)
+        
+        # Filter for mining-related content
+        if signal and _POW_RE.search(signal.get("signal", "")):
+            signals.append(signal)
+    
+    # Transforms always set "timestamp", so a C-level key is safe here
+    return nlargest(_MAX_ITEMS, signals, key=itemgetter("timestamp"))
+
+
+@dataclass(frozen=True, slots=True)
+class CategorySpec:
+    """Everything that differs between the market endpoints"""
+    cache_key: str
+    category: str  # response key and saved feed category
+    label: str
+    fetch_news: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    fetch_tweets: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    build: Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], List[Dict[str, Any]]]
+    keywords: Tuple[str, ...] = ()  # tweet search keywords, if fetch_tweets is a search
+
+
+def _keyword_spec(cache_key: str, category: str, label: str, merge_category: str, keywords: List[str]) -> CategorySpec:
+    """
+    Spec for an endpoint backed by latest news plus a keyword tweet search
+
+    merge_category must be a CategorizerAgent.CATEGORY_KEYWORDS key, since
+    merge_by_category keeps only items categorize_item() assigns to it.
+    """
+    return CategorySpec(
+        cache_key=cache_key,
+        category=category,
+        label=label,
+        fetch_news=partial(crypto_news_service.fetch_latest_news, limit=30),
+        fetch_tweets=partial(game_x_service.search_tweets_by_keywords, keywords, max_results=30),
+        build=partial(_merge_category, merge_category),
+        keywords=tuple(keywords)
+    )
+
+
+CATEGORY_SPECS: Dict[str, CategorySpec] = {
+    "trends": CategorySpec(
+        cache_key="markets:trends",
+        category="trends",
+        label="trends",
+        fetch_news=partial(crypto_news_service.fetch_trending_news, limit=30),
+        fetch_tweets=partial(game_x_service.fetch_latest_tweets, max_results=50),
+        build=partial(_merge_category, "trends")
+    ),
+    "liquidity": _keyword_spec(
+        "markets:liquidity", "liquidity", "liquidity", "liquidity",
+        ["liquidity", "volume", "dex", "trading", "swap", "pool"]
+    ),
+    "agents": _keyword_spec(
+        "markets:agents", "ai", "AI agents", "agents",
+        ["ai", "agent", "bot", "llm", "autonomous", "virtual"]
+    ),
+    "macro_events": _keyword_spec(
+        "markets:macro_events", "macro", "macro events", "macro_events",
+        ["regulation", "sec", "fed", "etf", "government", "policy", "institutional"]
+    ),
+    "proof_of_work": CategorySpec(
+        cache_key="markets:proof_of_work",
+        category="mining",
+        label="PoW",
+        fetch_news=partial(crypto_news_service.fetch_latest_news, limit=30),
+        fetch_tweets=partial(game_x_service.search_tweets_by_keywords, _POW_KEYWORDS, max_results=30),
+        build=_pow_signals,
+        keywords=tuple(_POW_KEYWORDS)
+    ),
+}
+
+
+async def _cached_response(cache_key: str) -> Optional[Response]:
+    """Cache hits go straight out as the stored JSON bytes"""
+    cached = await redis_client.get_raw(cache_key)
+    if cached:
+        return Response(content=cached, media_type="application/json")
+    return None
+
+
+async def _wait_for_cache(cache_key: str) -> Optional[Response]:
+    """Poll for another worker's rebuild, backing off up to ~1s in total"""
+    delay = 0.05
+    waited = 0.0
+    while waited < _LOCK_WAIT:
+        await asyncio.sleep(delay)
+        waited += delay
+        cached = await _cached_response(cache_key)
+        if cached:
+            return cached
+        delay *= 2
+    return None
+
+
+async def _serve(spec: CategorySpec) -> Union[Dict[str, Any], Response]:
+    """Cached fetch → build → save flow shared by every market endpoint"""
+    # Log calls pass args so loguru only formats them when a sink takes the level
+    cached = await _cached_response(spec.cache_key)
+    if cached:
+        logger.info("Returning cached {} data", spec.label)
+        return cached
+    
+    # Single-flight: one coroutine per process rebuilds a cold key, and the
+    # Redis lock keeps other workers from doing the same rebuild
+    async with _locks[spec.cache_key]:
+        cached = await _cached_response(spec.cache_key)
+        if cached:
+            logger.info("Returning cached {} data", spec.label)
+            return cached
+        
+        lock_key = f"{spec.cache_key}:lock"
+        lock_token = await redis_client.acquire_lock(lock_key, ttl=_LOCK_TTL)
+        if not lock_token:
+            cached = await _wait_for_cache(spec.cache_key)
+            if cached:
+                logger.info("Returning {} data rebuilt by another worker", spec.label)
+                return cached
+            # The other worker is slow or died; rebuild here
+        
+        try:
+            return await _rebuild(spec)
+        finally:
+            if lock_token:
+                await redis_client.release_lock(lock_key, lock_token)
+
+
+async def _prefetched(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return items
+
+
+async def _rebuild(
+    spec: CategorySpec,
+    tweets: Optional[List[Dict[str, Any]]] = None
+) -> Union[Dict[str, Any], Response]:
+    """Fetch, build, cache and save one endpoint's data; tweets may be prefetched"""
+    tweets_coro = spec.fetch_tweets() if tweets is None else _prefetched(tweets)
+    news, tweets = await _fetch_sources(spec.fetch_news(), tweets_coro)
+    stale_key = f"{spec.cache_key}:swr"
+    
+    # Nothing usable upstream (outage, rate limit): don't merge, and serve
+    # the last good payload instead of caching an empty one for an hour
+    if not news and not tweets:
+        stale = await _cached_response(stale_key)
+        if stale:
+            logger.warning("No upstream data for {}, serving last good payload", spec.label)
+            return stale
+    
+    # Transform/filter work is pure CPU; keep it off the event loop
+    items = await asyncio.to_thread(spec.build, news, tweets) if news or tweets else []
+    
+    result = {
+        spec.category: {"items": items[:_MAX_ITEMS]},
+        "_metadata": {
+            "total_items": len(items),
+            "timestamp": time.time(),
+            "cache_ttl": _CACHE_TTL
+        }
+    }
+    
+    if items:
+        await asyncio.gather(
+            redis_client.set(spec.cache_key, result),
+            redis_client.set(stale_key, result, ttl=_STALE_TTL)
+        )
+        # Save to database in background
+        write_batcher.put(spec.category, items)
+    else:
+        # Brief TTL so an empty result doesn't pin the endpoint for an hour
+        await redis_client.set(spec.cache_key, result, ttl=_EMPTY_TTL)
+    
+    logger.info("Fetched {}: {} items", spec.label, len(items))
+    return result
+
+
 class MarketsController:
     """Controller for handling market endpoints"""
     
     @staticmethod
-    async def get_trends() -> Dict[str, Any]:
+    async def get_trends() -> Union[Dict[str, Any], Response]:
         """
         Get trending crypto signals
         
         Returns:
             { "trends": { "items": [...] } }
         """
-        cache_key = "markets:trends"
-        
-        # Check cache
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info("Returning cached trends data")
-            return cached
-        
-        # Fetch fresh data
-        news = await crypto_news_service.fetch_trending_news(limit=30)
-        tweets = await game_x_service.fetch_latest_tweets(max_results=50)
-        
-        # Merge and format
-        merged = DataMergerAgent.merge_by_category("trends", news, tweets)
-        
-        # Add metadata
-        result = {
-            **merged,
-            "_metadata": {
-                "total_items": len(merged.get("trends", {}).get("items", [])),
-                "timestamp": time.time(),
-                "cache_ttl": 3600
-            }
-        }
-        
-        # Cache result
-        redis_client.set(cache_key, result)
-        
-        # Save to database in background
-        items = merged.get("trends", {}).get("items", [])
-        if items:
-            save_signal_items.send(items)
-            save_category_feed.send("trends", items)
-        
-        logger.info(f"Fetched trends: {len(items)} items")
-        return result
+        return await _serve(CATEGORY_SPECS["trends"])
     
     @staticmethod
-    async def get_liquidity() -> Dict[str, Any]:
+    async def get_liquidity() -> Union[Dict[str, Any], Response]:
         """
         Get liquidity-related signals
         
         Returns:
             { "liquidity": { "items": [...] } }
         """
-        cache_key = "markets:liquidity"
-        
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info("Returning cached liquidity data")
-            return cached
-        
-        # Fetch with liquidity keywords
-        keywords = ["liquidity", "volume", "dex", "trading", "swap", "pool"]
-        
-        news = await crypto_news_service.fetch_latest_news(limit=30)
-        tweets = await game_x_service.search_tweets_by_keywords(keywords, max_results=30)
-        
-        merged = DataMergerAgent.merge_by_category("defi", news, tweets)
-        
-        # Rename to liquidity for response
-        result = {
-            "liquidity": merged.get("defi", {"items": []}),
-            "_metadata": {
-                "total_items": len(merged.get("defi", {}).get("items", [])),
-                "timestamp": time.time(),
-                "cache_ttl": 3600
-            }
-        }
-        
-        items = result["liquidity"]["items"]
-        redis_client.set(cache_key, result)
-        
-        if items:
-            save_signal_items.send(items)
-            save_category_feed.send("liquidity", items)
-        
-        logger.info(f"Fetched liquidity: {len(items)} items")
-        return result
+        return await _serve(CATEGORY_SPECS["liquidity"])
     
     @staticmethod
-    async def get_agents() -> Dict[str, Any]:
+    async def get_agents() -> Union[Dict[str, Any], Response]:
         """
         Get AI agents signals
         
         Returns:
             { "ai": { "items": [...] } }
         """
-        cache_key = "markets:agents"
-        
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info("Returning cached agents data")
-            return cached
-        
-        keywords = ["ai", "agent", "bot", "llm", "autonomous", "virtual"]
-        
-        news = await crypto_news_service.fetch_latest_news(limit=30)
-        tweets = await game_x_service.search_tweets_by_keywords(keywords, max_results=30)
-        
-        merged = DataMergerAgent.merge_by_category("ai", news, tweets)
-        
-        result = {
-            "ai": merged.get("ai", {"items": []}),
-            "_metadata": {
-                "total_items": len(merged.get("ai", {}).get("items", [])),
-                "timestamp": time.time(),
-                "cache_ttl": 3600
-            }
-        }
-        
-        items = result["ai"]["items"]
-        redis_client.set(cache_key, result)
-        
-        if items:
-            save_signal_items.send(items)
-            save_category_feed.send("ai", items)
-        
-        logger.info(f"Fetched AI agents: {len(items)} items")
-        return result
+        return await _serve(CATEGORY_SPECS["agents"])
     
     @staticmethod
-    async def get_macro_events() -> Dict[str, Any]:
+    async def get_macro_events() -> Union[Dict[str, Any], Response]:
         """
         Get macro events signals
         
         Returns:
             { "macro": { "items": [...] } }
         """
-        cache_key = "markets:macro_events"
-        
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info("Returning cached macro events data")
-            return cached
-        
-        keywords = ["regulation", "sec", "fed", "etf", "government", "policy", "institutional"]
-        
-        news = await crypto_news_service.fetch_latest_news(limit=30)
-        tweets = await game_x_service.search_tweets_by_keywords(keywords, max_results=30)
-        
-        merged = DataMergerAgent.merge_by_category("macro", news, tweets)
-        
-        result = {
-            "macro": merged.get("macro", {"items": []}),
-            "_metadata": {
-                "total_items": len(merged.get("macro", {}).get("items", [])),
-                "timestamp": time.time(),
-                "cache_ttl": 3600
-            }
-        }
-        
-        items = result["macro"]["items"]
-        redis_client.set(cache_key, result)
-        
-        if items:
-            save_signal_items.send(items)
-            save_category_feed.send("macro", items)
-        
-        logger.info(f"Fetched macro events: {len(items)} items")
-        return result
+        return await _serve(CATEGORY_SPECS["macro_events"])
     
     @staticmethod
-    async def get_proof_of_work() -> Dict[str, Any]:
+    async def get_proof_of_work() -> Union[Dict[str, Any], Response]:
         """
         Get PoW mining signals
         
         Returns:
             { "mining": { "items": [...] } }
         """
-        cache_key = "markets:proof_of_work"
+        return await _serve(CATEGORY_SPECS["proof_of_work"])
+    
+    @staticmethod
+    async def warm_all_markets() -> Dict[str, bool]:
+        """
+        Refresh every market endpoint whose cache entry is missing
         
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info("Returning cached PoW data")
-            return cached
+        Checks all cache keys in a single pipelined round-trip and only
+        rebuilds the categories that are not cached.
         
-        keywords = ["mining", "hashrate", "miner", "pow", "difficulty", "asic"]
-        
-        news = await crypto_news_service.fetch_latest_news(limit=30)
-        tweets = await game_x_service.search_tweets_by_keywords(keywords, max_results=30)
-        
-        # Create mining category
-        all_items = news + tweets
-        signals = []
-        
-        from app.agents.data_merger import DataMergerAgent
-        for item in all_items:
-            if item.get("source") == "cryptonews":
-                signal = DataMergerAgent._transform_news_to_signal(item)
-            else:
-                signal = DataMergerAgent._transform_tweet_to_signal(item)
-            
-            if signal:
-                # Filter for mining-related content
-                text = signal.get("signal", "").lower()
-                if any(kw in text for kw in keywords):
-                    signals.append(signal)
-        
-        # Sort by timestamp
-        signals.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-        
-        result = {
-            "mining": {"items": signals[:50]},
-            "_metadata": {
-                "total_items": len(signals),
-                "timestamp": time.time(),
-                "cache_ttl": 3600
-            }
-        }
+        Returns:
+            { cache_key: refreshed }
+        """
+        specs = {spec.cache_key: spec for spec in CATEGORY_SPECS.values()}
+        
+        cached = await redis_client.mget(list(specs))
+        stale = [key for key, value in cached.items() if value is None]
         
-        redis_client.set(cache_key, result)
+        if stale:
+            await asyncio.gather(*(_serve(specs[key]) for key in stale), return_exceptions=True)
+            logger.info(f"Warmed market caches: {', '.join(stale)}")
         
-        if signals:
-            save_signal_items.send(signals)
-            save_category_feed.send("mining", signals)
+        return {key: key in stale for key in specs}
+    
+    @staticmethod
+    async def refresh_all_markets() -> None:
+        """
+        Rebuild every market endpoint concurrently, ahead of cache expiry
         
-        logger.info(f"Fetched PoW: {len(signals)} items")
-        return result
\ No newline at end of file
+        Each rebuild still holds its per-key lock, so it never races a
+        request that is already rebuilding the same key. The keyword
+        searches go out as one batched request; if it fails, each
+        category falls back to its own search.
+        """
+        groups = {spec.cache_key: spec.keywords for spec in CATEGORY_SPECS.values() if spec.keywords}
+        batched = await game_x_service.search_tweets_multi(groups, max_results=30 * len(groups)) or {}
+        
+        async def refresh(spec: CategorySpec):
+            tweets = batched.get(spec.cache_key)
+            async with _locks[spec.cache_key]:
+                await _rebuild(spec, tweets[:30] if tweets is not None else None)
+        
+        results = await asyncio.gather(
+            *(refresh(spec) for spec in CATEGORY_SPECS.values()),
+            return_exceptions=True
+        )
+        for spec, outcome in zip(CATEGORY_SPECS.values(), results):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error refreshing {spec.label}: {str(outcome)}")
@@ -12,9 +12,17 @@ class Settings(BaseSettings):
     # Game X
     GAME_API_KEY: str
     GAME_ACCESS_TOKEN: str
+    GAME_X_MAX_CONCURRENCY: int = 16  # in-flight requests, incl. the per-account fan-out
+    GAME_X_MAX_RPS: float = 10
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 5
+    DB_USE_PGBOUNCER: bool = False  # transaction pooling: no prepared statements
+    DB_NULL_POOL: bool = False  # short-lived processes: no connection pooling
     
     # Redis
     REDIS_URL: str
@@ -27,6 +35,7 @@ class Settings(BaseSettings):
     APP_ENV: str = "development"
     LOG_LEVEL: str = "INFO"
     API_PORT: int = 8080 
+    API_WORKERS: Optional[int] = None  # default: max(2, cpu_count // 2) outside development
 
     # Extra APP fields in your .env
     APP_NAME: Optional[str] = None
@@ -54,6 +63,7 @@ class Settings(BaseSettings):
 
     # Payment configuration 
     PAYMENT_PRICE_PER_REQUEST: float = 0.001 # Price in currency
+    X402_VERIFY_TTL: int = 60  # Seconds a verified payment hash is trusted per route
     
     class Config:
         env_file = ".env"
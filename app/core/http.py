@@ -0,0 +1,34 @@
+"""
+Shared HTTP client for upstream API calls
+One connection pool (and TLS context) reused by every service
+"""
+
+from typing import Optional
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # With a custom transport the pool and HTTP/2 settings live on it;
+            # retries=1 only re-attempts failed connections, below any status retries
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                retries=1
+            )
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared client; called once at application shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
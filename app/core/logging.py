@@ -11,7 +11,8 @@ def setup_logging():
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
         level=settings.LOG_LEVEL,
-        colorize=True
+        colorize=settings.APP_ENV == "development",  # skip ANSI codes in production
+        enqueue=True  # writes happen on loguru's background thread
     )
     
     logger.add(
@@ -19,7 +20,9 @@ def setup_logging():
         rotation="00:00",
         retention="7 days",
         level=settings.LOG_LEVEL,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} - {message}"
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} - {message}",
+        enqueue=True,
+        buffering=65536  # batch small writes into fewer syscalls
     )
     
     return logger
\ No newline at end of file
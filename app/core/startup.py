@@ -4,7 +4,10 @@ from app.cache.redis_client import redis_client
 from app.services.cryptonews import crypto_news_service
 from app.services.game_x import game_x_service
 from app.services.payment import payment_service
+from app.core.http import close_client
 from app.workers.cleanup import cleanup_worker
+from app.workers.cache_warmer import cache_warmer
+from app.queue.batcher import write_batcher
 import sys
 import anyio
 
@@ -23,32 +26,32 @@ async def startup_checks():
     all_checks_passed = True
     
     # # 1. Database Connection
-    logger.info("\n[1/6] Checking Database Connection...")
+    logger.info("\n[1/7] Checking Database Connection...")
     db_status = await init_db()
 
     if not db_status:
         all_checks_passed = False
     
     # 2. Redis Connection
-    logger.info("\n[2/6] Checking Redis Connection...")
+    logger.info("\n[2/7] Checking Redis Connection...")
     redis_status = await redis_client.connect()
     if not redis_status:
         all_checks_passed = False
     
     # 3. CryptoNews API
-    logger.info("\n[3/6] Checking CryptoNews API...")
+    logger.info("\n[3/7] Checking CryptoNews API...")
     cryptonews_status = await crypto_news_service.initialize()
     if not cryptonews_status:
         all_checks_passed = False
     
     # 4. GAME X API
-    logger.info("\n[4/6] Checking GAME X API...")
+    logger.info("\n[4/7] Checking GAME X API...")
     gamex_status = await game_x_service.initialize()
     if not gamex_status:
         all_checks_passed = False
     
     # 5. Payment Service
-    logger.info("\n[5/6] Initializing Payment Service...")
+    logger.info("\n[5/7] Initializing Payment Service...")
     try:
         await payment_service.initialize()
     except Exception as e:
@@ -56,13 +59,28 @@ async def startup_checks():
         all_checks_passed = False
     
     # 6. Cleanup Worker
-    logger.info("\n[6/6] Starting Cleanup Worker...")
+    logger.info("\n[6/7] Starting Cleanup Worker...")
     try:
         cleanup_worker.start()
     except Exception as e:
         logger.error(f"✗ Cleanup worker failed to start: {str(e)}")
         all_checks_passed = False
     
+    # 7. Cache Warmer
+    logger.info("\n[7/7] Starting Cache Warmer...")
+    try:
+        cache_warmer.start()
+    except Exception as e:
+        logger.error(f"✗ Cache warmer failed to start: {str(e)}")
+        all_checks_passed = False
+    
+    # Write batcher for background saves
+    try:
+        write_batcher.start()
+    except Exception as e:
+        logger.error(f"✗ Write batcher failed to start: {str(e)}")
+        all_checks_passed = False
+    
     # Final Status
     logger.info("\n" + "=" * 60)
     if all_checks_passed:
@@ -98,10 +116,37 @@ async def shutdown_handlers():
     except:
         pass
     
+    try:
+        await close_client()
+        logger.info("✓ Shared HTTP client closed")
+    except:
+        pass
+    
     try:
         cleanup_worker.stop()
         logger.info("✓ Cleanup worker stopped")
     except:
         pass
     
-    logger.info("✓ Shutdown complete\n")
\ No newline at end of file
+    try:
+        cache_warmer.stop()
+        logger.info("✓ Cache warmer stopped")
+    except:
+        pass
+    
+    try:
+        await write_batcher.stop()
+        logger.info("✓ Write batcher drained")
+    except:
+        pass
+    
+    try:
+        await redis_client.close()
+        logger.info("✓ Redis connection closed")
+    except:
+        pass
+    
+    logger.info("✓ Shutdown complete\n")
+    
+    # Flush records still queued for the background log writer
+    await logger.complete()
\ No newline at end of file
@@ -2,6 +2,7 @@
 Database module - SQLAlchemy models and session management
 """
 
-from app.database.session import  AsyncSessionLocal, init_db
+from app.database.session import AsyncSessionLocal, get_session, init_db
+from app.database.maintenance import delete_in_batches
 
-__all__ = [ "AsyncSessionLocal", "init_db"]
\ No newline at end of file
+__all__ = ["AsyncSessionLocal", "get_session", "init_db", "delete_in_batches"]
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Bulk maintenance helpers (retention cleanup)
+"""
+
+import asyncio
+import time
+from typing import Optional
+from sqlalchemy import delete, select
+from app.database.session import AsyncSessionLocal
+
+
+async def delete_in_batches(
+    model,
+    condition,
+    batch_size: int = 1000,
+    time_budget: Optional[float] = None,
+    order_by=None
+) -> int:
+    """
+    Delete matching rows in short transactions of at most batch_size rows
+    
+    Each batch is a Core DELETE ... WHERE id IN (SELECT id ... LIMIT n), so
+    no rows are loaded into the session, and each commits on its own so the
+    cleanup makes progress under statement_timeout and keeps lock hold time
+    and WAL per transaction bounded. With a time_budget (seconds) it stops
+    after the batch that crosses it; the next run picks up the rest.
+    
+    Pass the indexed column from the condition as order_by so each batch
+    is read as an index range scan from the oldest row.
+    
+    Returns:
+        Number of rows deleted
+    """
+    total = 0
+    started = time.monotonic()
+    while True:
+        async with AsyncSessionLocal() as db, db.begin():
+            batch = select(model.id).where(condition)
+            if order_by is not None:
+                batch = batch.order_by(order_by)
+            batch = batch.limit(batch_size)
+            result = await db.execute(delete(model).where(model.id.in_(batch)))
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+        if time_budget is not None and time.monotonic() - started >= time_budget:
+            return total
+        # Let other work on the loop run between batches
+        await asyncio.sleep(0)
@@ -0,0 +1,19 @@
+-- One feed row per category, required by the ON CONFLICT (category) upsert
+
+-- Keep only the most recently updated row of each category
+DELETE FROM category_feeds
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY category
+                   ORDER BY last_updated DESC NULLS LAST, created_at DESC NULLS LAST
+               ) AS rn
+        FROM category_feeds
+    ) ranked
+    WHERE rn > 1
+);
+
+-- The unique index replaces the plain lookup index on the same column
+DROP INDEX IF EXISTS idx_category;
+CREATE UNIQUE INDEX idx_category ON category_feeds(category);
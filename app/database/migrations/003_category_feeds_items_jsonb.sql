@@ -0,0 +1,3 @@
+-- Store feed items as binary JSON so reads skip reparsing the text
+-- Rewrites the table under an ACCESS EXCLUSIVE lock; category_feeds is a few rows
+ALTER TABLE category_feeds ALTER COLUMN items TYPE JSONB USING items::jsonb;
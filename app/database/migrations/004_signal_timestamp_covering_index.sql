@@ -0,0 +1,8 @@
+-- Replace the plain timestamp index with one covering id, so the retention
+-- cleanup's "SELECT id WHERE timestamp < cutoff" runs as an index-only scan
+-- CONCURRENTLY can't run inside a transaction block; apply statement by statement
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_signal_timestamp_id
+    ON signal_items(timestamp) INCLUDE (id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_signal_timestamp;
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from contextlib import asynccontextmanager
 from sqlalchemy import text
 from app.core.config import settings
@@ -13,12 +14,43 @@ from loguru import logger
 # -------------------------------------------
 # ASYNC ENGINE
 # -------------------------------------------
+def _engine_options() -> dict:
+    """Pool and driver options for the async engine"""
+    if _use_pgbouncer:
+        # PgBouncer in transaction mode can't keep prepared statements, and it
+        # rejects unknown startup parameters, so jit=off belongs on the role there
+        # (ALTER ROLE ... SET jit = off)
+        connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    else:
+        connect_args = {"server_settings": {"jit": "off"}}
+
+    if settings.DB_NULL_POOL:
+        return {"poolclass": NullPool, "connect_args": connect_args}
+
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_args": connect_args,
+    }
+
+
+def _async_database_url(url: str) -> str:
+    """Point plain postgres:// / postgresql:// URLs at the asyncpg driver"""
+    for scheme in ("postgresql://", "postgres://"):
+        if url.startswith(scheme):
+            return "postgresql+asyncpg://" + url[len(scheme):]
+    return url
+
+
+_use_pgbouncer = settings.DB_USE_PGBOUNCER or "pgbouncer" in settings.DATABASE_URL
+
 engine = create_async_engine(
-    settings.DATABASE_URL,         # Must be async driver e.g. postgres+asyncpg
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=False
+    _async_database_url(settings.DATABASE_URL),
+    echo=False,
+    **_engine_options()
 )
 
 # -------------------------------------------
@@ -70,7 +102,8 @@ async def init_db():
             logger.info("✓ Async database connected successfully")
 
             # If using PostgreSQL w/ PgBouncer:
-            await conn.execute(text("DISCARD PLANS"))
+            if _use_pgbouncer:
+                await conn.execute(text("DISCARD PLANS"))
 
         return True
 
@@ -1,10 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.startup import startup_checks, shutdown_handlers
 from app.middleware.x402 import X402PaymentMiddleware
+from app.middleware.errors import UnhandledErrorMiddleware
 from app.routes import markets
 import sys
 
@@ -17,9 +19,19 @@ app = FastAPI(
     description="Real-time crypto news and social media aggregation service",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Middleware added last runs outermost: CORS wraps everything, so 402s and
+# 500s carry CORS headers too
+
+# X402 Payment middleware
+app.add_middleware(X402PaymentMiddleware)
+
+# Catch-all for unexpected errors, covering the payment middleware
+app.add_middleware(UnhandledErrorMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -29,9 +41,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# X402 Payment middleware
-app.add_middleware(X402PaymentMiddleware)
-
 # Include routers
 app.include_router(markets.router)
 
@@ -52,10 +61,18 @@ async def shutdown_event():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+    
+    development = settings.APP_ENV == "development"
+    # uvloop/httptools ship with uvicorn[standard] but uvloop has no Windows build
+    fast_io = sys.platform != "win32"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=settings.API_PORT,
-        reload=settings.APP_ENV == "development"
+        loop="uvloop" if fast_io else "auto",
+        http="httptools" if fast_io else "auto",
+        workers=1 if development else settings.API_WORKERS or max(2, (os.cpu_count() or 2) // 2),
+        reload=development
     )
\ No newline at end of file
@@ -3,5 +3,6 @@ Middleware module - Custom middleware components
 """
 
 from app.middleware.x402 import X402PaymentMiddleware
+from app.middleware.errors import UnhandledErrorMiddleware
 
-__all__ = ["X402PaymentMiddleware"]
\ No newline at end of file
+__all__ = ["X402PaymentMiddleware", "UnhandledErrorMiddleware"]
\ No newline at end of file
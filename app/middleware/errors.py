@@ -0,0 +1,21 @@
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from loguru import logger
+
+
+class UnhandledErrorMiddleware(BaseHTTPMiddleware):
+    """
+    Log unexpected errors once and return a uniform 500
+    
+    A middleware rather than an exception handler: Starlette re-raises after
+    calling Exception handlers, and uvicorn would then log every traceback a
+    second time. Add it inside CORSMiddleware so these 500s keep CORS headers.
+    """
+    
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            logger.opt(exception=exc).error("Unhandled error on {}", request.url.path)
+            return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
@@ -1,11 +1,14 @@
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.services.payment import payment_service
-from app.models.payment import PaymentTransaction
-from app.database.session import AsyncSessionLocal
+from app.cache.redis_client import redis_client
+from app.core.config import settings
+from app import queue
 from datetime import datetime
 from loguru import logger
+import asyncio
+import hashlib
 
 
 class X402PaymentMiddleware(BaseHTTPMiddleware):
@@ -19,12 +22,29 @@ class X402PaymentMiddleware(BaseHTTPMiddleware):
         "/markets/macro_events",
         "/markets/proof_of_work"
     ]
+    # str.startswith takes a tuple and checks every prefix in C
+    _PAID_PREFIXES = tuple(PAID_ENDPOINTS)
+    
+    def __init__(self, app):
+        super().__init__(app)
+        # Price and facilitator are fixed for the process, so the 402 body is too
+        self._payment_required_content = {
+            "error": "Payment Required",
+            "message": "This endpoint requires payment. Include X-Payment-Hash header.",
+            "payment_details": {
+                "amount": payment_service.price_per_request,
+                "currency": "USD",
+                "facilitator": payment_service.facilitator_url
+            }
+        }
     
     async def dispatch(self, request: Request, call_next):
         """Process request and verify payment if required"""
         
+        path = request.url.path
+        
         # Check if endpoint requires payment
-        if not any(request.url.path.startswith(endpoint) for endpoint in self.PAID_ENDPOINTS):
+        if not path.startswith(self._PAID_PREFIXES):
             return await call_next(request)
         
         # Get payment hash from header
@@ -32,26 +52,26 @@ class X402PaymentMiddleware(BaseHTTPMiddleware):
         
         if not payment_hash:
             # Return payment required response
-            payment_headers = payment_service.get_payment_headers(request.url.path)
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=402,
-                content={
-                    "error": "Payment Required",
-                    "message": "This endpoint requires payment. Include X-Payment-Hash header.",
-                    "payment_details": {
-                        "amount": payment_service.price_per_request,
-                        "currency": "USD",
-                        "facilitator": payment_service.facilitator_url
-                    }
-                },
-                headers=payment_headers
+                content=self._payment_required_content,
+                headers=payment_service.get_payment_headers(path)
             )
         
+        # A hash verified recently for this route skips the facilitator call
+        # (and the transaction row, which was written on first verification)
+        price = payment_service.price_per_request
+        verify_key = self._verification_key(payment_hash, path)
+        # Read from Redis itself: a key revoked after a failed settlement must stop
+        # working in every worker, not linger in another's in-process cache
+        if await redis_client.exists(verify_key):
+            return await self._serve_and_settle(request, call_next, payment_hash, price, verify_key)
+        
         # Verify payment
         verification = await payment_service.verify_payment(payment_hash)
         
         if not verification.get("verified"):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=402,
                 content={
                     "error": "Payment Verification Failed",
@@ -60,51 +80,63 @@ class X402PaymentMiddleware(BaseHTTPMiddleware):
                 }
             )
         
-        # Log payment transaction
-        db = AsyncSessionLocal()
+        await redis_client.set(verify_key, True, ttl=settings.X402_VERIFY_TTL)
+        
+        # Log payment transaction off the request path
         try:
-            transaction = PaymentTransaction(
-                payment_hash=payment_hash,
-                endpoint=request.url.path,
-                amount=payment_service.price_per_request,
-                verified=True,
-                verified_at=datetime.utcnow(),
-                user_identifier=request.client.host if request.client else None
+            # Package exports resolve lazily, so Dramatiq loads on first paid request
+            await asyncio.to_thread(
+                queue.log_payment_transaction.send,
+                payment_hash,
+                path,
+                price,
+                request.client.host if request.client else None,
+                datetime.utcnow().isoformat()
             )
-            db.add(transaction)
-            db.commit()
-            logger.info(f"Payment verified for {request.url.path}: {payment_hash[:16]}...")
+            logger.info("Payment verified for {}: {:.16}...", path, payment_hash)
         except Exception as e:
-            logger.error(f"Error logging payment transaction: {str(e)}")
-            db.rollback()
-        finally:
-            db.close()
+            logger.error(f"Error queueing payment transaction: {str(e)}")
         
+        return await self._serve_and_settle(request, call_next, payment_hash, price, verify_key)
+    
+    @staticmethod
+    def _verification_key(payment_hash: str, path: str) -> str:
+        """Cache key for a verified (payment hash, route) pair"""
+        digest = hashlib.sha256(payment_hash.encode()).hexdigest()
+        return f"verif:{digest}:{path}"
+    
+    async def _serve_and_settle(
+        self,
+        request: Request,
+        call_next,
+        payment_hash: str,
+        price: float,
+        verify_key: str
+    ):
+        """
+        Process the paid request, then settle the payment on success
+        
+        A rejected settlement revokes the route's verification, so the hash
+        isn't trusted again without another facilitator check.
+        """
         # Process request
         response = await call_next(request)
         
         # Settle payment after successful response
         if response.status_code == 200:
-            settlement = await payment_service.settle_payment(
-                payment_hash,
-                payment_service.price_per_request
-            )
+            settlement = await payment_service.settle_payment(payment_hash, price)
             
             if settlement.get("settled"):
-                # Update transaction
-                db = AsyncSessionLocal()
                 try:
-                    transaction = db.query(PaymentTransaction).filter(
-                        PaymentTransaction.payment_hash == payment_hash
-                    ).first()
-                    if transaction:
-                        transaction.settled = True
-                        transaction.settled_at = datetime.utcnow()
-                        db.commit()
+                    await asyncio.to_thread(
+                        queue.update_settlement.send,
+                        payment_hash,
+                        datetime.utcnow().isoformat()
+                    )
                 except Exception as e:
-                    logger.error(f"Error updating settlement: {str(e)}")
-                    db.rollback()
-                finally:
-                    db.close()
+                    logger.error(f"Error queueing settlement update: {str(e)}")
+            else:
+                await redis_client.delete(verify_key)
+                logger.warning("Settlement failed for {}, verification revoked: {:.16}...", request.url.path, payment_hash)
         
         return response
\ No newline at end of file
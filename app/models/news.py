@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Text, JSON, Float, Integer, ARRAY, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Text, Float, Integer, ARRAY, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from datetime import datetime
 import uuid
 from app.database.session import Base
@@ -15,7 +15,7 @@ class SignalItem(Base):
     signal = Column(Text, nullable=False)  # Main headline/signal
     sentiment = Column(String(20))  # bullish, bearish, neutral
     sentiment_value = Column(Float)  # 0.0 to 1.0
-    timestamp = Column(Float, nullable=False, index=True)  # Unix timestamp
+    timestamp = Column(Float, nullable=False)  # Unix timestamp, indexed below
     feed_categories = Column(ARRAY(String))  # Array of categories
     short_context = Column(Text)  # Brief summary
     long_context = Column(Text)  # Detailed context
@@ -30,6 +30,9 @@ class SignalItem(Base):
     
     __table_args__ = (
         Index('idx_timestamp_categories', 'timestamp', 'feed_categories'),
+        # Covers the batched cleanup's "SELECT id WHERE timestamp < cutoff" as an
+        # index-only scan; btree scans backwards for ORDER BY timestamp DESC too
+        Index('idx_signal_timestamp_id', 'timestamp', postgresql_include=['id']),  # 004 migration
         Index('idx_sentiment', 'sentiment'),
     )
 
@@ -42,12 +45,14 @@ class CategoryFeed(Base):
     __tablename__ = "category_feeds"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    category = Column(String(50), nullable=False, index=True)  # rwa, defi, etc.
-    items = Column(JSON, nullable=False)  # Array of signal items
+    category = Column(String(50), nullable=False)  # rwa, defi, etc.; one row each, see idx_category
+    items = Column(JSONB, nullable=False)  # Array of signal items (binary JSON, not reparsed on read)
     item_count = Column(Integer, default=0)
     last_updated = Column(Float, index=True)  # Unix timestamp
     created_at = Column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
+        # Unique so feed upserts can target ON CONFLICT (category) (002 migration)
+        Index('idx_category', 'category', unique=True),
         Index('idx_category_updated', 'category', 'last_updated'),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Float, Boolean
+from sqlalchemy import Column, String, DateTime, Float, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -17,4 +17,9 @@ class PaymentTransaction(Base):
     user_identifier = Column(String(200))
     created_at = Column(DateTime, default=datetime.utcnow)
     verified_at = Column(DateTime)
-    settled_at = Column(DateTime)
\ No newline at end of file
+    settled_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Range scan for the retention cleanup (matches 001_initial_schema.sql)
+        Index('idx_payment_created', 'created_at'),
+    )
@@ -1,18 +1,31 @@
 """
 Queue module - Background job processing with Dramatiq
+
+Exports are resolved on first access so importing the batcher does not
+pull in Dramatiq and the broker setup until a task is actually sent.
 """
 
-from app.queue.tasks import (
-    save_signal_items,
-    save_category_feed,
-    process_and_merge_feeds,
-)
-from app.queue.worker import setup_worker, get_worker_info
+from importlib import import_module
+
+_EXPORTS = {
+    "save_signal_items": "app.queue.tasks",
+    "save_category_feed": "app.queue.tasks",
+    "save_signals_and_feed": "app.queue.tasks",
+    "save_merged_categories": "app.queue.tasks",
+    "process_and_merge_feeds": "app.queue.tasks",
+    "log_payment_transaction": "app.queue.tasks",
+    "update_settlement": "app.queue.tasks",
+    "WriteBatcher": "app.queue.batcher",
+    "write_batcher": "app.queue.batcher",
+    "setup_worker": "app.queue.worker",
+    "get_worker_info": "app.queue.worker",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "save_signal_items",
-    "save_category_feed",
-    "process_and_merge_feeds",
-    "setup_worker",
-    "get_worker_info",
-]
\ No newline at end of file
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
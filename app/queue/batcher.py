@@ -0,0 +1,193 @@
+"""
+Bounded write batcher for database save tasks
+Coalesces signal items across requests before handing them to Dramatiq
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+
+@lru_cache(maxsize=None)
+def _tasks():
+    """Import the Dramatiq tasks (and broker) on first send, not at API startup"""
+    from app.queue import tasks
+    return tasks
+
+
+class WriteBatcher:
+    """Bounded queue + worker pool that batches save_signals_and_feed sends"""
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        workers: int = 2,
+        max_batch: int = 200,
+        flush_interval: float = 0.25,
+        max_pending: int = 5000
+    ):
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+
+        # Overflow when the queue is full: category -> {id: item}
+        self._pending: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._pending_count = 0
+
+        # Gauges
+        self.drop_count = 0
+        self.flush_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Entries waiting in the queue plus coalesced overflow items"""
+        queued = self.queue.qsize() if self.queue else 0
+        return queued + self._pending_count
+
+    def stats(self) -> Dict[str, Any]:
+        """Current batcher gauges"""
+        return {
+            "queue_depth": self.queue_depth,
+            "drop_count": self.drop_count,
+            "flush_latency": self.flush_latency
+        }
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self.workers = [
+            asyncio.create_task(self._run()) for _ in range(self.worker_count)
+        ]
+        logger.info(f"✓ Write batcher started with {self.worker_count} workers")
+
+    async def stop(self, timeout: float = 10.0):
+        """Drain queued writes, then stop the workers"""
+        if not self.queue:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Write batcher drain timed out with {self.queue.qsize()} entries queued")
+
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        if self._pending:
+            await self._flush({}, {})
+        logger.info(f"Write batcher stopped: {self.stats()}")
+
+    def put(self, category: str, items: List[Dict[str, Any]]):
+        """
+        Enqueue items for saving without blocking the caller
+
+        When the queue is full the items are merged into a pending set keyed
+        by category and id; once that is full too, further items are dropped.
+        """
+        if not items:
+            return
+        if not self.queue:
+            # Batcher not running (e.g. outside the API process)
+            _tasks().save_signals_and_feed.send(category, items)
+            return
+        try:
+            self.queue.put_nowait((category, items))
+        except asyncio.QueueFull:
+            bucket = self._pending.setdefault(category, {})
+            for item in items:
+                key = item.get("id", id(item))
+                if key in bucket:
+                    bucket[key] = item
+                elif self._pending_count < self.max_pending:
+                    bucket[key] = item
+                    self._pending_count += 1
+                else:
+                    self.drop_count += 1
+
+    async def _run(self):
+        """Worker loop: accumulate up to max_batch items or flush_interval, then flush"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                entry = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                if self._pending:
+                    await self._flush({}, {})
+                continue
+
+            signals: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+            feeds: Dict[str, List[Dict[str, Any]]] = {}
+            taken = 1
+            count = self._collect(entry, signals, feeds)
+
+            deadline = loop.time() + self.flush_interval
+            while count < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                taken += 1
+                count += self._collect(entry, signals, feeds)
+
+            try:
+                await self._flush(signals, feeds)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
+
+    @staticmethod
+    def _collect(
+        entry,
+        signals: Dict[str, Dict[Any, Dict[str, Any]]],
+        feeds: Dict[str, List[Dict[str, Any]]]
+    ) -> int:
+        """Fold one queued entry into the current batch; returns the number of items added"""
+        category, items = entry
+        bucket = signals.setdefault(category, {})
+        before = len(bucket)
+        for item in items:
+            bucket[item.get("id", id(item))] = item
+        # A category feed is replaced wholesale, so the latest list wins
+        feeds[category] = items
+        return len(bucket) - before
+
+    async def _flush(
+        self,
+        signals: Dict[str, Dict[Any, Dict[str, Any]]],
+        feeds: Dict[str, List[Dict[str, Any]]]
+    ):
+        """Send the batch (plus any coalesced overflow) to Dramatiq, one message per category"""
+        pending, self._pending, self._pending_count = self._pending, {}, 0
+        for category, bucket in pending.items():
+            signals.setdefault(category, {}).update(bucket)
+            feeds.setdefault(category, list(bucket.values()))
+
+        if not feeds:
+            return
+
+        started = time.perf_counter()
+        try:
+            tasks = await asyncio.to_thread(_tasks)
+            for category, items in feeds.items():
+                batch = list(signals.get(category, {}).values())
+                # Only ship the signal list separately when it adds to the feed
+                extra = batch if len(batch) > len(items) else None
+                await asyncio.to_thread(tasks.save_signals_and_feed.send, category, items, extra)
+        except Exception as e:
+            logger.error(f"Error flushing write batch: {str(e)}")
+        finally:
+            self.flush_latency = time.perf_counter() - started
+
+
+# Global batcher instance
+write_batcher = WriteBatcher()
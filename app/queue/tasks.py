@@ -7,21 +7,91 @@ import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 from app.core.config import settings
 from app.database.session import AsyncSessionLocal
+from app.database.maintenance import delete_in_batches
 from app.models.news import SignalItem, CategoryFeed
+from app.models.payment import PaymentTransaction
 from app.services.cryptonews import crypto_news_service
 from app.services.game_x import game_x_service
 from app.agents.data_merger import DataMergerAgent
 
 import asyncio
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from loguru import logger
 import time
+import uuid
 
 # Setup Dramatiq broker
 redis_broker = RedisBroker(url=settings.DRAMATIQ_REDIS_URL)
 dramatiq.set_broker(redis_broker)
 
+# One event loop per worker process for async DB work. Actors run on several
+# threads, and pooled asyncpg connections must stay on the loop that made them.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="dramatiq-async", daemon=True).start()
+
+
+def run_async(coro):
+    """Run a coroutine on the worker's shared event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+def _signal_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for one signal item"""
+    item_id = item.get("id")
+    return {
+        "id": uuid.UUID(str(item_id)) if item_id else uuid.uuid4(),
+        "signal": item.get("signal"),
+        "sentiment": item.get("sentiment"),
+        "sentiment_value": item.get("sentiment_value"),
+        "timestamp": item.get("timestamp"),
+        "feed_categories": item.get("feed_categories", []),
+        "short_context": item.get("short_context"),
+        "long_context": item.get("long_context"),
+        "sources": item.get("sources", []),
+        "author": item.get("author"),
+        "tokens": item.get("tokens", []),
+        "tweet_url": item.get("tweet_url"),
+        "narrative_id": item.get("narrative_id", "None")
+    }
+
+
+async def _add_signal_items(db, items: List[Dict[str, Any]]) -> int:
+    """Insert signal items not stored yet in one statement; returns how many were added"""
+    rows = [_signal_row(item) for item in items if item.get("signal")]
+    if not rows:
+        return 0
+    
+    # Existing ids are skipped by the primary key instead of a SELECT per item
+    result = await db.execute(
+        pg_insert(SignalItem).values(rows).on_conflict_do_nothing(index_elements=["id"])
+    )
+    return result.rowcount
+
+
+async def _upsert_category_feed(db, category: str, items: List[Dict[str, Any]]):
+    """Replace the category's feed row, creating it if needed, in one statement"""
+    stmt = pg_insert(CategoryFeed).values(
+        category=category,
+        items=items,
+        item_count=len(items),
+        last_updated=time.time()
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["category"],
+            set_={
+                "items": stmt.excluded["items"],
+                "item_count": stmt.excluded.item_count,
+                "last_updated": stmt.excluded.last_updated,
+            }
+        )
+    )
+    logger.info(f"Saved category feed for: {category}")
+
 
 @dramatiq.actor(queue_name="data_storage", max_retries=3)
 def save_signal_items(items: List[Dict[str, Any]]):
@@ -31,42 +101,15 @@ def save_signal_items(items: List[Dict[str, Any]]):
     Args:
         items: List of signal items
     """
-    db = AsyncSessionLocal()
+    async def save():
+        async with AsyncSessionLocal() as db, db.begin():
+            return await _add_signal_items(db, items)
+    
     try:
-        saved_count = 0
-        for item in items:
-            # Check if item already exists by id
-            existing = db.query(SignalItem).filter(
-                SignalItem.id == item.get("id")
-            ).first()
-            
-            if not existing:
-                signal_item = SignalItem(
-                    id=item.get("id"),
-                    signal=item.get("signal"),
-                    sentiment=item.get("sentiment"),
-                    sentiment_value=item.get("sentiment_value"),
-                    timestamp=item.get("timestamp"),
-                    feed_categories=item.get("feed_categories", []),
-                    short_context=item.get("short_context"),
-                    long_context=item.get("long_context"),
-                    sources=item.get("sources", []),
-                    author=item.get("author"),
-                    tokens=item.get("tokens", []),
-                    tweet_url=item.get("tweet_url"),
-                    narrative_id=item.get("narrative_id", "None")
-                )
-                db.add(signal_item)
-                saved_count += 1
-        
-        db.commit()
+        saved_count = run_async(save())
         logger.info(f"Saved {saved_count} new signal items to database")
-        
     except Exception as e:
         logger.error(f"Error saving signal items: {str(e)}")
-        db.rollback()
-    finally:
-        db.close()
 
 
 @dramatiq.actor(queue_name="data_storage", max_retries=3)
@@ -78,40 +121,123 @@ def save_category_feed(category: str, items: List[Dict[str, Any]]):
         category: Category name
         items: List of signal items for this category
     """
-    db = AsyncSessionLocal()
+    async def save():
+        async with AsyncSessionLocal() as db, db.begin():
+            await _upsert_category_feed(db, category, items)
+    
     try:
-        # Check if feed exists for this category
-        existing = db.query(CategoryFeed).filter(
-            CategoryFeed.category == category
-        ).order_by(CategoryFeed.last_updated.desc()).first()
-        
-        current_timestamp = time.time()
-        
-        # Update existing or create new
-        if existing and (current_timestamp - existing.last_updated) < 3600:
-            # Update existing feed if less than 1 hour old
-            existing.items = items
-            existing.item_count = len(items)
-            existing.last_updated = current_timestamp
-            logger.info(f"Updated category feed for: {category}")
-        else:
-            # Create new feed entry
-            category_feed = CategoryFeed(
-                category=category,
-                items=items,
-                item_count=len(items),
-                last_updated=current_timestamp
-            )
-            db.add(category_feed)
-            logger.info(f"Created new category feed for: {category}")
-        
-        db.commit()
-        
+        run_async(save())
     except Exception as e:
         logger.error(f"Error saving category feed: {str(e)}")
-        db.rollback()
-    finally:
-        db.close()
+
+
+@dramatiq.actor(queue_name="data_storage", max_retries=3)
+def save_signals_and_feed(
+    category: str,
+    items: List[Dict[str, Any]],
+    signals: List[Dict[str, Any]] = None
+):
+    """
+    Save signal items and the category feed in one message and transaction
+    
+    Args:
+        category: Category name
+        items: Signal items making up the category feed
+        signals: Signal items to store, if more than the feed (defaults to items)
+    """
+    async def save():
+        async with AsyncSessionLocal() as db, db.begin():
+            saved_count = await _add_signal_items(db, signals if signals is not None else items)
+            await _upsert_category_feed(db, category, items)
+            return saved_count
+    
+    try:
+        saved_count = run_async(save())
+        logger.info(f"Saved {saved_count} new signal items for: {category}")
+    except Exception as e:
+        logger.error(f"Error saving signals and feed for {category}: {str(e)}")
+
+
+@dramatiq.actor(queue_name="data_storage", max_retries=3)
+def save_merged_categories(categories: Dict[str, List[Dict[str, Any]]]):
+    """
+    Save signal items and feeds for several categories in one transaction
+    
+    Args:
+        categories: Category name -> signal items for that category
+    """
+    async def save():
+        async with AsyncSessionLocal() as db, db.begin():
+            saved_count = 0
+            for category, items in categories.items():
+                saved_count += await _add_signal_items(db, items)
+                await _upsert_category_feed(db, category, items)
+            return saved_count
+    
+    try:
+        saved_count = run_async(save())
+        logger.info(f"Saved {saved_count} new signal items across {len(categories)} categories")
+    except Exception as e:
+        logger.error(f"Error saving merged categories: {str(e)}")
+
+
+@dramatiq.actor(queue_name="payment_log", max_retries=3)
+def log_payment_transaction(
+    payment_hash: str,
+    endpoint: str,
+    amount: float,
+    user_identifier: Optional[str],
+    verified_at: str
+):
+    """
+    Record a verified payment
+    
+    Args:
+        payment_hash: Verified payment hash
+        endpoint: Paid endpoint path
+        amount: Price charged
+        user_identifier: Client host, if known
+        verified_at: ISO timestamp of verification
+    """
+    async def insert():
+        async with AsyncSessionLocal() as db, db.begin():
+            db.add(PaymentTransaction(
+                payment_hash=payment_hash,
+                endpoint=endpoint,
+                amount=amount,
+                verified=True,
+                verified_at=datetime.fromisoformat(verified_at),
+                user_identifier=user_identifier
+            ))
+    
+    try:
+        run_async(insert())
+        logger.info(f"Payment transaction logged for {endpoint}: {payment_hash[:16]}...")
+    except Exception as e:
+        logger.error(f"Error logging payment transaction: {str(e)}")
+
+
+@dramatiq.actor(queue_name="payment_log", max_retries=3)
+def update_settlement(payment_hash: str, settled_at: str):
+    """
+    Mark a payment transaction as settled
+    
+    Args:
+        payment_hash: Settled payment hash
+        settled_at: ISO timestamp of settlement
+    """
+    async def mark_settled():
+        async with AsyncSessionLocal() as db, db.begin():
+            await db.execute(
+                update(PaymentTransaction)
+                .where(PaymentTransaction.payment_hash == payment_hash)
+                .values(settled=True, settled_at=datetime.fromisoformat(settled_at))
+            )
+    
+    try:
+        run_async(mark_settled())
+    except Exception as e:
+        logger.error(f"Error updating settlement: {str(e)}")
 
 
 @dramatiq.actor(queue_name="data_processing")
@@ -123,12 +249,19 @@ def process_and_merge_feeds(category: str = None):
         category: Optional category to process
     """
     try:
-        # Run async operations
-        loop = asyncio.get_event_loop()
-        
         async def fetch_and_merge():
-            news = await crypto_news_service.fetch_trending_news(limit=50)
-            tweets = await game_x_service.fetch_latest_tweets(max_results=50)
+            news, tweets = await asyncio.gather(
+                crypto_news_service.fetch_trending_news(limit=50),
+                game_x_service.fetch_latest_tweets(max_results=50),
+                return_exceptions=True
+            )
+            # A failing source is skipped so the other can still be merged
+            if isinstance(news, Exception):
+                logger.error(f"Error fetching news: {str(news)}")
+                news = []
+            if isinstance(tweets, Exception):
+                logger.error(f"Error fetching tweets: {str(tweets)}")
+                tweets = []
             
             if category:
                 merged = DataMergerAgent.merge_by_category(category, news, tweets)
@@ -137,14 +270,20 @@ def process_and_merge_feeds(category: str = None):
             
             return merged
         
-        result = loop.run_until_complete(fetch_and_merge())
+        # Run on the worker's shared loop rather than the deprecated implicit one
+        result = run_async(fetch_and_merge())
         
-        # Save results
-        for cat_name, cat_data in result.items():
-            items = cat_data.get("items", [])
-            if items:
-                save_signal_items.send(items)
-                save_category_feed.send(cat_name, items)
+        # Save results: one message for every category
+        if category:
+            categories = {category: result.get("items", [])}
+        else:
+            categories = {
+                cat_name: cat_data.get("items", [])
+                for cat_name, cat_data in result.get("categories", {}).items()
+            }
+        categories = {cat_name: items for cat_name, items in categories.items() if items}
+        if categories:
+            save_merged_categories.send(categories)
         
         logger.info(f"Processed and merged feeds for category: {category or 'all'}")
         
@@ -157,21 +296,20 @@ def cleanup_old_signals():
     """
     Clean up old signal items (older than 24 hours)
     """
-    db = AsyncSessionLocal()
+    cutoff_timestamp = time.time() - (24 * 3600)  # 24 hours ago
+    
+    async def cleanup():
+        # Delete old signals, then old category feeds
+        deleted_signals = await delete_in_batches(
+            SignalItem, SignalItem.timestamp < cutoff_timestamp
+        )
+        deleted_feeds = await delete_in_batches(
+            CategoryFeed, CategoryFeed.last_updated < cutoff_timestamp
+        )
+        return deleted_signals, deleted_feeds
+    
     try:
-        cutoff_timestamp = time.time() - (24 * 3600)  # 24 hours ago
-        
-        # Delete old signals
-        deleted_count = db.query(SignalItem).filter(
-            SignalItem.timestamp < cutoff_timestamp
-        ).delete()
-        
-        # Delete old category feeds
-        deleted_feeds = db.query(CategoryFeed).filter(
-            CategoryFeed.last_updated < cutoff_timestamp
-        ).delete()
-        
-        db.commit()
+        deleted_count, deleted_feeds = run_async(cleanup())
         
         if deleted_count > 0 or deleted_feeds > 0:
             logger.info(
@@ -181,6 +319,3 @@ def cleanup_old_signals():
         
     except Exception as e:
         logger.error(f"Error during cleanup: {str(e)}")
-        db.rollback()
-    finally:
-        db.close()
\ No newline at end of file
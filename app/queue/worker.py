@@ -39,7 +39,7 @@ def get_worker_info():
     """Get information about worker configuration"""
     return {
         "broker_url": settings.DRAMATIQ_REDIS_URL,
-        "queues": ["data_storage", "data_processing"],
+        "queues": ["data_storage", "data_processing", "data_cleanup", "payment_log"],
         "middleware": [
             "AgeLimit (1 hour)",
             "TimeLimit (5 minutes)",
@@ -75,6 +75,7 @@ if __name__ == "__main__":
     print("\n✓ Queues:")
     print("  - data_storage (save operations)")
     print("  - data_processing (processing operations)")
+    print("  - payment_log (payment transaction records)")
     
     print("\n" + "=" * 60)
     print("Worker is ready to process tasks")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from app.controllers.markets_controller import MarketsController
 
 router = APIRouter(prefix="/markets", tags=["markets"])
@@ -12,10 +12,7 @@ async def get_trends():
     Returns:
         Merged data from CryptoNews API and Twitter feeds for trending topics
     """
-    try:
-        return await MarketsController.get_trends()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await MarketsController.get_trends()
 
 
 @router.get("/liquidity")
@@ -26,10 +23,7 @@ async def get_liquidity():
     Returns:
         Merged data about trading volume, liquidity pools, and DEX activity
     """
-    try:
-        return await MarketsController.get_liquidity()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await MarketsController.get_liquidity()
 
 
 @router.get("/agents")
@@ -40,10 +34,7 @@ async def get_agents():
     Returns:
         Merged data about AI agents, bots, and automation in crypto
     """
-    try:
-        return await MarketsController.get_agents()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await MarketsController.get_agents()
 
 
 @router.get("/macro_events")
@@ -54,10 +45,7 @@ async def get_macro_events():
     Returns:
         Merged data about regulations, institutional adoption, and macro events
     """
-    try:
-        return await MarketsController.get_macro_events()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await MarketsController.get_macro_events()
 
 
 @router.get("/proof_of_work")
@@ -68,7 +56,4 @@ async def get_proof_of_work():
     Returns:
         Merged data about mining, hashrate, and PoW developments
     """
-    try:
-        return await MarketsController.get_proof_of_work()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    return await MarketsController.get_proof_of_work()
\ No newline at end of file
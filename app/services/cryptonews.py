@@ -1,8 +1,43 @@
+import asyncio
 import httpx
-from typing import List, Dict, Any
+import orjson
+from functools import wraps
+from typing import List, Dict, Any, Callable, Awaitable, Hashable, Sequence
+from cachetools import TTLCache
 from app.core.config import settings
+from app.core.http import get_client
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
+from app.services.rate_limit import RateLimiter, get_with_retry
+
+# Category branches fetch the same lists within one aggregation run
+_FETCH_CACHE_TTL = 60
+
+
+def _cached_fetch(fn):
+    """Serve repeat calls from the fetch cache and share identical in-flight calls."""
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        return await self._cached(key, lambda: fn(self, *args, **kwargs))
+    return wrapper
+
+
+def _to_news_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one CryptoNews API article onto the internal news item shape."""
+    get = item.get
+    return {
+        "source": "cryptonews",
+        "title": get("title", ""),
+        "content": get("text", ""),
+        "url": get("news_url", ""),
+        "published_at": get("date", ""),
+        "source_name": get("source_name", ""),
+        "image_url": get("image_url", ""),
+        "sentiment": get("sentiment", "neutral"),
+        "tickers": get("tickers", []),
+        "topics": get("topics", [])
+    }
+
 
 class CryptoNewsService:
     def __init__(self):
@@ -10,6 +45,16 @@ class CryptoNewsService:
         self.base_url = "https://cryptonews-api.com/api/v1"
         self.client = None
 
+        # Stay under the provider's limits instead of replaying 429s
+        self._limiter = RateLimiter(concurrency=8, max_rate=5)
+
+        # Recent results by (method, args), plus fetches currently running
+        self._fetch_cache: TTLCache = TTLCache(maxsize=64, ttl=_FETCH_CACHE_TTL)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        # Set once the search endpoint turns out not to be on this plan
+        self._search_unsupported = False
+
         # Lazy validation flags
         self._api_key_validated = False
         self._api_key_invalid = False
@@ -41,14 +86,15 @@ class CryptoNewsService:
     async def initialize(self):
         """Initialize HTTP client and test connection."""
         try:
-            self.client = httpx.AsyncClient(timeout=30.0)
+            # Pooled client shared with the other services
+            self.client = get_client()
 
             # Validate key before test request
             if not self.validate_api_key():
                 return False
 
             # Test with a simple request - use the correct endpoint structure
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}/category",
                 params={
                     "token": self.api_key,
@@ -75,14 +121,14 @@ class CryptoNewsService:
             logger.error(f"✗ CryptoNews API initialization failed: {str(e)}")
             return False
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @_cached_fetch
     async def fetch_trending_news(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch trending crypto news via category endpoint."""
         if not self.validate_api_key():
             return []
 
         try:
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}/category",
                 params={
                     "token": self.api_key,
@@ -97,27 +143,14 @@ class CryptoNewsService:
                 return []
 
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Handle API error responses
             if "error" in data:
                 logger.error(f"❌ API error: {data['error']}")
                 return []
 
-            news_items = []
-            for item in data.get("data", []):
-                news_items.append({
-                    "source": "cryptonews",
-                    "title": item.get("title", ""),
-                    "content": item.get("text", ""),
-                    "url": item.get("news_url", ""),
-                    "published_at": item.get("date", ""),
-                    "source_name": item.get("source_name", ""),
-                    "image_url": item.get("image_url", ""),
-                    "sentiment": item.get("sentiment", "neutral"),
-                    "topics": item.get("topics", []),
-                    "tickers": item.get("tickers", [])  # Add tickers if available
-                })
+            news_items = [_to_news_item(item) for item in data.get("data", [])]
 
             logger.info(f"✅ Fetched {len(news_items)} trending news items")
             return news_items
@@ -129,7 +162,7 @@ class CryptoNewsService:
             logger.error(f"Error fetching trending news: {str(e)}")
             return []
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    @_cached_fetch
     async def fetch_latest_news(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch latest crypto news."""
         if not self.validate_api_key():
@@ -137,7 +170,7 @@ class CryptoNewsService:
 
         try:
             # Use the correct endpoint for latest news
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}",  # Base endpoint for latest news
                 params={
                     "token": self.api_key,
@@ -151,27 +184,14 @@ class CryptoNewsService:
                 return []
 
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Handle API error responses
             if "error" in data:
                 logger.error(f"❌ API error: {data['error']}")
                 return []
 
-            news_items = []
-            for item in data.get("data", []):
-                news_items.append({
-                    "source": "cryptonews",
-                    "title": item.get("title", ""),
-                    "content": item.get("text", ""),
-                    "url": item.get("news_url", ""),
-                    "published_at": item.get("date", ""),
-                    "source_name": item.get("source_name", ""),
-                    "image_url": item.get("image_url", ""),
-                    "sentiment": item.get("sentiment", "neutral"),
-                    "tickers": item.get("tickers", []),
-                    "topics": item.get("topics", [])
-                })
+            news_items = [_to_news_item(item) for item in data.get("data", [])]
 
             logger.info(f"✅ Fetched {len(news_items)} latest news items")
             return news_items
@@ -183,13 +203,14 @@ class CryptoNewsService:
             logger.error(f"Error fetching latest news: {str(e)}")
             return []
 
+    @_cached_fetch
     async def fetch_ticker_news(self, tickers: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch news for specific tickers."""
         if not self.validate_api_key():
             return []
 
         try:
-            response = await self.client.get(
+            response = await self._get(
                 f"{self.base_url}",
                 params={
                     "token": self.api_key,
@@ -204,27 +225,14 @@ class CryptoNewsService:
                 return []
 
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Handle API error responses
             if "error" in data:
                 logger.error(f"❌ API error: {data['error']}")
                 return []
 
-            news_items = []
-            for item in data.get("data", []):
-                news_items.append({
-                    "source": "cryptonews",
-                    "title": item.get("title", ""),
-                    "content": item.get("text", ""),
-                    "url": item.get("news_url", ""),
-                    "published_at": item.get("date", ""),
-                    "source_name": item.get("source_name", ""),
-                    "image_url": item.get("image_url", ""),
-                    "sentiment": item.get("sentiment", "neutral"),
-                    "tickers": item.get("tickers", []),
-                    "topics": item.get("topics", [])
-                })
+            news_items = [_to_news_item(item) for item in data.get("data", [])]
 
             logger.info(f"✅ Fetched {len(news_items)} news items for {tickers}")
             return news_items
@@ -233,10 +241,76 @@ class CryptoNewsService:
             logger.error(f"Error fetching ticker news: {str(e)}")
             return []
 
+    async def search_news(self, keywords: Sequence[str], limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Fetch news matching any keyword, filtered server-side where the plan allows.
+
+        Plans without search access get the latest news instead, so callers
+        should still filter the result locally.
+        """
+        if not self.validate_api_key():
+            return []
+
+        if not self._search_unsupported:
+            try:
+                response = await self._get(
+                    f"{self.base_url}/search",
+                    params={
+                        "token": self.api_key,
+                        "search": " OR ".join(keywords),
+                        "items": limit
+                    }
+                )
+
+                if response.status_code in (403, 404):
+                    # Not available on this plan; stop asking
+                    logger.info("CryptoNews search unavailable, filtering latest news locally")
+                    self._search_unsupported = True
+                else:
+                    response.raise_for_status()
+                    data = orjson.loads(response.content)
+                    if "error" not in data:
+                        news_items = [_to_news_item(item) for item in data.get("data", [])]
+                        logger.info(f"✅ Found {len(news_items)} news items for keywords")
+                        return news_items
+                    logger.error(f"❌ API error: {data['error']}")
+
+            except Exception as e:
+                logger.error(f"Error searching news: {str(e)}")
+
+        return await self.fetch_latest_news(limit=limit)
+
+    async def _cached(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Return a cached result, join an identical running fetch, or start one."""
+        cached = self._fetch_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one cancelled caller doesn't cancel the fetch for the rest
+        items = await asyncio.shield(task)
+
+        # Failed fetches come back empty; don't hold those for the TTL
+        if items:
+            self._fetch_cache[key] = items
+        return list(items)
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET through the shared client, throttled, retrying 429/5xx and transport errors."""
+        return await get_with_retry(self.client, url, params, self._limiter)
+
     async def close(self):
-        """Close the HTTP client."""
-        if self.client:
-            await self.client.aclose()
+        """Release the shared HTTP client; it is closed at application shutdown."""
+        self.client = None
 
 
 # Create global instance
@@ -3,12 +3,20 @@ GAME X Service using official GAME SDK
 Integrates with Twitter/X data through GAME X API
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from app.core.config import settings
+from app.core.http import get_client
 from loguru import logger
 from game_sdk.game.worker import Worker
 from game_sdk.game.custom_types import Function, Argument, FunctionResultStatus
+from app.services.rate_limit import RateLimiter
+from app.services.keywords import KeywordMatcher, search_text
+import asyncio
 import httpx
+import orjson
+
+# Shared read-only default for tweets without (or with null) public_metrics
+_NO_METRICS: Dict[str, int] = {}
 
 
 class GameXService:
@@ -20,18 +28,24 @@ class GameXService:
         self.x_accounts = settings.X_ACCOUNTS
         self.worker = None
         self.client = None
+        self._headers: Dict[str, str] = {}
+        # Caps the per-account fan-out too; higher than CryptoNews by default
+        self._limiter = RateLimiter(
+            concurrency=settings.GAME_X_MAX_CONCURRENCY,
+            max_rate=settings.GAME_X_MAX_RPS
+        )
+        # Identical GETs currently running, shared by concurrent callers
+        self._inflight: Dict[Tuple[str, Tuple], asyncio.Task] = {}
     
     async def initialize(self):
         """Initialize GAME X SDK worker and verify connection"""
         try:
-            # Initialize HTTP client for direct API calls
-            self.client = httpx.AsyncClient(
-                timeout=30.0,
-                headers={
-                    "Authorization": f"Bearer {self.access_token}",
-                    "X-API-Key": self.api_key
-                }
-            )
+            # Shared HTTP client for direct API calls; auth goes on each request
+            self.client = get_client()
+            self._headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "X-API-Key": self.api_key
+            }
             
             # Initialize GAME SDK Worker
             self.worker = Worker(
@@ -90,13 +104,13 @@ class GameXService:
         """Fetch tweets from a specific user using GAME X API"""
         try:
             # Using GAME X API endpoint for user tweets
-            response = await self.client.get(
+            response = await self._get(
                 f"https://api.game.virtuals.io/api/twitter/user/{username}/tweets",
                 params={"max_results": max_results}
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return self._normalize_tweets(data.get("data", []))
             else:
                 logger.warning(f"Failed to fetch tweets for @{username}: {response.status_code}")
@@ -107,15 +121,33 @@ class GameXService:
             return []
     
     async def _fetch_all_accounts(self, limit_per_account: int) -> List[Dict[str, Any]]:
-        """Fetch tweets from all monitored accounts"""
-        all_tweets = []
+        """Fetch tweets from all monitored accounts concurrently, bounded by the rate limiter"""
+        results = await asyncio.gather(
+            *(self._fetch_user_tweets(account, limit_per_account) for account in self.x_accounts),
+            return_exceptions=True
+        )
         
-        for account in self.x_accounts:
-            tweets = await self._fetch_user_tweets(account, limit_per_account)
+        all_tweets = []
+        for account, tweets in zip(self.x_accounts, results):
+            if isinstance(tweets, Exception):
+                logger.error(f"Error fetching tweets for @{account}: {str(tweets)}")
+                continue
             all_tweets.extend(tweets)
         
         return all_tweets
     
+    async def get_all_account_feeds(self, limit_per_account: int = 10) -> List[Dict[str, Any]]:
+        """
+        Fetch recent tweets from every monitored account
+        
+        Args:
+            limit_per_account: Maximum tweets to fetch per account
+            
+        Returns:
+            List of tweet dictionaries
+        """
+        return await self._fetch_all_accounts(limit_per_account)
+    
     async def search_tweets_by_keywords(
         self, 
         keywords: List[str], 
@@ -136,7 +168,7 @@ class GameXService:
             query = " OR ".join(keywords)
             
             # Search using GAME X API
-            response = await self.client.get(
+            response = await self._get(
                 "https://api.game.virtuals.io/api/twitter/search",
                 params={
                     "query": query,
@@ -145,7 +177,7 @@ class GameXService:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 tweets = self._normalize_tweets(data.get("data", []))
                 logger.info(f"Found {len(tweets)} tweets for keywords: {', '.join(keywords)}")
                 return tweets
@@ -157,31 +189,90 @@ class GameXService:
             logger.error(f"Error searching tweets: {str(e)}")
             return []
     
-    async def search_related_posts(self, keywords: List[str]) -> List[Dict[str, Any]]:
+    async def search_tweets_multi(
+        self,
+        keyword_groups: Dict[str, Sequence[str]],
+        max_results: int = 200
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Run several keyword searches as one OR-joined request
+        
+        Each returned tweet is matched locally against every group, so one
+        round-trip serves all of them.
+        
+        Args:
+            keyword_groups: Keyword list per group name
+            max_results: Maximum results for the combined search
+            
+        Returns:
+            Matching tweets per group, or None if the search failed
+        """
+        keywords = list(dict.fromkeys(kw for group in keyword_groups.values() for kw in group))
+        if not keywords:
+            return {group: [] for group in keyword_groups}
+        
+        try:
+            response = await self._get(
+                "https://api.game.virtuals.io/api/twitter/search",
+                params={
+                    "query": " OR ".join(keywords),
+                    "max_results": max_results
+                }
+            )
+            
+            if response.status_code != 200:
+                logger.warning(f"Batched tweet search failed: {response.status_code}")
+                return None
+            
+            tweets = self._normalize_tweets(orjson.loads(response.content).get("data", []))
+            
+        except Exception as e:
+            logger.error(f"Error in batched tweet search: {str(e)}")
+            return None
+        
+        # Whole-word matching: the shared result set mixes every group's tweets,
+        # so "sec" must not claim tweets about a "second"
+        matchers = {group: KeywordMatcher(kws, whole_words=True) for group, kws in keyword_groups.items()}
+        buckets: Dict[str, List[Dict[str, Any]]] = {group: [] for group in keyword_groups}
+        for tweet in tweets:
+            text = search_text(tweet, "text")
+            for group, matcher in matchers.items():
+                if matcher.search_folded(text):
+                    buckets[group].append(tweet)
+        
+        logger.info(f"Batched search found {len(tweets)} tweets for {len(keyword_groups)} groups")
+        return buckets
+    
+    async def search_related_posts(
+        self,
+        keywords: Sequence[str],
+        matcher: Optional[KeywordMatcher] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search for posts related to news keywords across all monitored accounts
         
         Args:
             keywords: Keywords from news articles
+            matcher: Prebuilt matcher for these keywords, for fixed keyword sets
             
         Returns:
             Related tweets
         """
-        all_tweets = []
+        # Keyword search and recent tweets from all accounts are independent
+        keyword_tweets, recent_tweets = await asyncio.gather(
+            self.search_tweets_by_keywords(keywords, max_results=30),
+            self._fetch_all_accounts(limit_per_account=5)
+        )
+        all_tweets = list(keyword_tweets)
         
-        # Search by keywords
-        keyword_tweets = await self.search_tweets_by_keywords(keywords, max_results=30)
-        all_tweets.extend(keyword_tweets)
-        
-        # Also get recent tweets from all accounts
-        recent_tweets = await self._fetch_all_accounts(limit_per_account=5)
-        
-        # Filter recent tweets by keywords
+        # Filter recent tweets by keywords, skipping ones the search already found
+        matcher = matcher or KeywordMatcher(keywords)
+        seen = {tweet["id"] for tweet in all_tweets}
         for tweet in recent_tweets:
-            text = tweet.get("text", "").lower()
-            if any(keyword.lower() in text for keyword in keywords):
-                if tweet not in all_tweets:  # Avoid duplicates
-                    all_tweets.append(tweet)
+            tweet_id = tweet["id"]
+            if tweet_id not in seen and matcher.search_folded(search_text(tweet, "text")):
+                seen.add(tweet_id)
+                all_tweets.append(tweet)
         
         logger.info(f"Found {len(all_tweets)} related tweets for keywords")
         return all_tweets
@@ -197,42 +288,33 @@ class GameXService:
             Normalized tweet dictionaries
         """
         normalized = []
+        append = normalized.append
+        extract_username = self._extract_username
         
         for tweet in tweets_data:
             try:
-                # Extract tweet data
-                tweet_id = tweet.get("id", "")
-                text = tweet.get("text", "")
-                author_id = tweet.get("author_id", "")
-                username = tweet.get("username", "") or self._extract_username(tweet)
-                created_at = tweet.get("created_at", "")
-                
-                # Get engagement metrics
-                metrics = tweet.get("public_metrics", {})
-                retweet_count = metrics.get("retweet_count", 0)
-                like_count = metrics.get("like_count", 0)
-                reply_count = metrics.get("reply_count", 0)
-                quote_count = metrics.get("quote_count", 0)
+                get = tweet.get
+                tweet_id = get("id", "")
+                username = get("username", "") or extract_username(tweet)
+                created_at = get("created_at", "")
+                metric = (get("public_metrics") or _NO_METRICS).get
                 
-                # Build normalized tweet
-                normalized_tweet = {
+                append({
                     "source": "twitter",
                     "id": tweet_id,
-                    "text": text,
-                    "author_id": author_id,
+                    "text": get("text", ""),
+                    "author_id": get("author_id", ""),
                     "username": username,
                     "created_at": created_at,
                     "date": created_at,  # For date normalization
                     "url": f"https://twitter.com/{username}/status/{tweet_id}" if username else "",
-                    "retweet_count": retweet_count,
-                    "like_count": like_count,
-                    "reply_count": reply_count,
-                    "quote_count": quote_count,
-                    "entities": tweet.get("entities", {}),
-                    "referenced_tweets": tweet.get("referenced_tweets", []),
-                }
-                
-                normalized.append(normalized_tweet)
+                    "retweet_count": metric("retweet_count", 0),
+                    "like_count": metric("like_count", 0),
+                    "reply_count": metric("reply_count", 0),
+                    "quote_count": metric("quote_count", 0),
+                    "entities": get("entities", {}),
+                    "referenced_tweets": get("referenced_tweets", []),
+                })
                 
             except Exception as e:
                 logger.warning(f"Error normalizing tweet: {str(e)}")
@@ -251,11 +333,32 @@ class GameXService:
                 return users[0].get("username", "")
         return ""
     
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        GET through the shared client, throttled by the rate limiter
+        
+        Concurrent category requests fetch the same account feeds; an
+        identical GET already in flight is awaited instead of re-sent.
+        """
+        key = (url, tuple(sorted(params.items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(url, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shielded so one cancelled caller doesn't cancel the request for the rest
+        return await asyncio.shield(task)
+    
+    async def _send(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        async with self._limiter:
+            response = await self.client.get(url, params=params, headers=self._headers)
+        self._limiter.update(response)
+        return response
+    
     async def close(self):
-        """Close HTTP client"""
-        if self.client:
-            await self.client.aclose()
-            logger.info("GAME X service closed")
+        """Release the shared HTTP client; it is closed at application shutdown"""
+        self.client = None
 
 
 # Singleton instance
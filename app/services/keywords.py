@@ -0,0 +1,73 @@
+"""
+Keyword filtering for fetched news and tweets
+"""
+
+from typing import Any, Dict, Iterable, Optional
+import ahocorasick
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive "contains any keyword" test over one Aho-Corasick automaton
+
+    Matches plain substrings, like the `keyword in text` checks it replaces,
+    but scans each text once however many keywords there are. With
+    whole_words=True a keyword must match a whole word, optionally plural,
+    so short terms like "ai" or "sec" don't fire inside "said" or "second"
+    while "agent" still matches "agents".
+    """
+
+    __slots__ = ("_automaton", "_whole_words")
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False):
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            if keyword:
+                folded = keyword.casefold()
+                # Value is the offset from a match's end index back to its start
+                automaton.add_word(folded, len(folded) - 1)
+
+        self._whole_words = whole_words
+
+        self._automaton: Optional[ahocorasick.Automaton] = None
+        if len(automaton):
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in text"""
+        return self.search_folded(text.casefold()) if text else False
+
+    def search_folded(self, text: str) -> bool:
+        """search() for text that is already casefolded, such as search_text()"""
+        if self._automaton is None or not text:
+            return False
+        if not self._whole_words:
+            return next(self._automaton.iter(text), None) is not None
+        for end, offset in self._automaton.iter(text):
+            start = end - offset
+            if start and text[start - 1].isalnum():
+                continue
+            after = end + 1
+            if after < len(text) and text[after] == "s":
+                after += 1
+            if after >= len(text) or not text[after].isalnum():
+                return True
+        return False
+
+
+def search_text(item: Dict[str, Any], *fields: str) -> str:
+    """
+    Casefolded search text for an item, computed once per set of fields
+
+    Fetched items are served from the fetch cache to several category
+    searches, so later searches reuse the folded text. It is kept on the item
+    under a key naming the fields, e.g. "_norm:title,content", so callers
+    folding different fields never read each other's text; a string key keeps
+    the item serializable.
+    """
+    key = "_norm:" + ",".join(fields)
+    norm = item.get(key)
+    if norm is None:
+        norm = item[key] = " ".join(item.get(field) or "" for field in fields).casefold()
+    return norm
@@ -6,9 +6,25 @@ Coordinates between CryptoNews and GAME X services
 from typing import Dict, Any, List
 from app.services.cryptonews import crypto_news_service
 from app.services.game_x import game_x_service
+from app.services.keywords import KeywordMatcher, search_text
 from app.agents.data_merger import DataMergerAgent
 from app.agents.categorizer import CategorizerAgent
 from loguru import logger
+import asyncio
+
+
+# Tweet search keywords per category; trends uses the general account feed
+_CATEGORY_KEYWORDS = {
+    "liquidity": ("liquidity", "volume", "dex", "swap", "trading"),
+    "agents": ("ai", "agent", "bot", "automation", "virtual", "llm"),
+    "macro_events": ("regulation", "sec", "fed", "etf", "government", "institutional"),
+    "proof_of_work": ("mining", "hashrate", "miner", "pow", "difficulty"),
+}
+
+# Built once at import instead of per request
+_CATEGORY_MATCHERS = {
+    category: KeywordMatcher(keywords) for category, keywords in _CATEGORY_KEYWORDS.items()
+}
 
 
 class MergerService:
@@ -26,8 +42,10 @@ class MergerService:
             # Fetch from both sources
             logger.info("Fetching data from CryptoNews and GAME X...")
             
-            news_items = await crypto_news_service.fetch_trending_news(limit=50)
-            tweets = await game_x_service.get_all_account_feeds(limit_per_account=10)
+            news_items, tweets = await asyncio.gather(
+                crypto_news_service.fetch_trending_news(limit=50),
+                game_x_service.get_all_account_feeds(limit_per_account=10)
+            )
             
             # Merge all data
             merged_data = DataMergerAgent.merge_feeds(news_items, tweets)
@@ -61,33 +79,21 @@ class MergerService:
             
             # Determine search strategy based on category
             if category == "trends":
-                news_items = await crypto_news_service.fetch_trending_news(limit=30)
-                tweets = await game_x_service.get_all_account_feeds(limit_per_account=5)
-            
-            elif category == "liquidity":
-                news_items = await crypto_news_service.fetch_latest_news(limit=30)
-                keywords = ["liquidity", "volume", "dex", "swap", "trading"]
-                tweets = await game_x_service.search_related_posts(keywords)
-            
-            elif category == "agents":
-                news_items = await crypto_news_service.fetch_latest_news(limit=30)
-                keywords = ["ai", "agent", "bot", "automation", "virtual", "llm"]
-                tweets = await game_x_service.search_related_posts(keywords)
-            
-            elif category == "macro_events":
-                news_items = await crypto_news_service.fetch_latest_news(limit=30)
-                keywords = ["regulation", "sec", "fed", "etf", "government", "institutional"]
-                tweets = await game_x_service.search_related_posts(keywords)
-            
-            elif category == "proof_of_work":
-                news_items = await crypto_news_service.fetch_latest_news(limit=30)
-                keywords = ["mining", "hashrate", "miner", "pow", "difficulty"]
-                tweets = await game_x_service.search_related_posts(keywords)
+                news_coro = crypto_news_service.fetch_trending_news(limit=30)
+            else:
+                news_coro = crypto_news_service.fetch_latest_news(limit=30)
             
+            keywords = _CATEGORY_KEYWORDS.get(category)
+            if keywords:
+                tweets_coro = game_x_service.search_related_posts(
+                    keywords, _CATEGORY_MATCHERS[category]
+                )
             else:
-                # Default: fetch general data
-                news_items = await crypto_news_service.fetch_latest_news(limit=30)
-                tweets = await game_x_service.get_all_account_feeds(limit_per_account=5)
+                # Trends and unknown categories: general feed from all accounts
+                tweets_coro = game_x_service.get_all_account_feeds(limit_per_account=5)
+            
+            # Both sources are independent; fetch them concurrently
+            news_items, tweets = await asyncio.gather(news_coro, tweets_coro)
             
             # Merge by category
             merged_data = DataMergerAgent.merge_by_category(
@@ -127,19 +133,20 @@ class MergerService:
         try:
             logger.info(f"Searching for keywords: {', '.join(keywords)}")
             
-            # Search in news (CryptoNews API doesn't have keyword search in basic plan)
-            # So we fetch latest and filter
-            news_items = await crypto_news_service.fetch_latest_news(limit=50)
-            
-            # Filter news by keywords
-            filtered_news = []
-            for item in news_items:
-                text = f"{item.get('title', '')} {item.get('content', '')}".lower()
-                if any(keyword.lower() in text for keyword in keywords):
-                    filtered_news.append(item)
+            # Search news server-side (falls back to latest news on plans
+            # without search), while the tweet search runs alongside
+            news_items, tweets = await asyncio.gather(
+                crypto_news_service.search_news(keywords, limit=50),
+                game_x_service.search_related_posts(keywords)
+            )
             
-            # Search tweets
-            tweets = await game_x_service.search_related_posts(keywords)
+            # Filter news by keywords; a no-op for real search results, and
+            # required for the latest-news fallback
+            matcher = KeywordMatcher(keywords)
+            filtered_news = [
+                item for item in news_items
+                if matcher.search_folded(search_text(item, "title", "content"))
+            ]
             
             # Merge results
             merged_data = DataMergerAgent.merge_feeds(filtered_news, tweets)
@@ -1,8 +1,19 @@
+import asyncio
+import re
 import httpx
+import orjson
 from typing import Dict, Any, Optional
 from app.core.config import settings
 from loguru import logger
 
+# Bodies are encoded with orjson and sent as raw content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Loose shape check: hex (optionally 0x-prefixed), base58 and base64url
+# transaction hashes all pass; whitespace, junk and oversized values don't
+_PLAUSIBLE_HASH = re.compile(r"[A-Za-z0-9_\-]{16,256}")
+_MALFORMED_HASH = "Malformed payment hash"
+
 
 class PaymentService:
     """Service for handling X402 payment verification and settlement"""
@@ -10,32 +21,79 @@ class PaymentService:
     def __init__(self):
         self.facilitator_url = f"https://{settings.FACILITATOR_URL}"
         self.price_per_request = settings.PAYMENT_PRICE_PER_REQUEST
+        # Everything but the endpoint is fixed for the process
+        self._base_headers = {
+            "X-Accepts-Payment": "true",
+            "X-Payment-Required": "true",
+            "X-Payment-Amount": str(self.price_per_request),
+            "X-Payment-Currency": "USD",
+            "X-Payment-Facilitator": self.facilitator_url
+        }
         self.client = None
+        # Verifications currently in flight, shared by requests with the same hash.
+        # Completed results aren't kept here: the middleware trusts a verified
+        # hash per route through its own Redis key
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     async def initialize(self):
         """Initialize HTTP client"""
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Every paid request verifies and settles against the same host, so
+        # keep plenty of warm connections and multiplex them over HTTP/2
+        self.client = httpx.AsyncClient(
+            base_url=self.facilitator_url,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=1000,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0
+            ),
+            http2=True,
+            headers={"User-Agent": "cryptonews-aggregator"}
+        )
         logger.info("✓ Payment service initialized")
     
     async def verify_payment(self, payment_hash: str) -> Dict[str, Any]:
         """
         Verify payment with facilitator
         
+        Concurrent requests carrying the same hash share one facilitator call.
+        
         Args:
             payment_hash: The payment hash from X-Payment-Hash header
             
         Returns:
             Verification result with status and details
         """
+        if not _PLAUSIBLE_HASH.fullmatch(payment_hash):
+            return {
+                "verified": False,
+                "payment_hash": payment_hash,
+                "error": _MALFORMED_HASH
+            }
+        self._require_client()
+        
+        task = self._inflight.get(payment_hash)
+        if task is None:
+            task = asyncio.ensure_future(self._verify(payment_hash))
+            self._inflight[payment_hash] = task
+            task.add_done_callback(lambda _: self._inflight.pop(payment_hash, None))
+        
+        # Shielded so one disconnecting client doesn't cancel it for the rest
+        return await asyncio.shield(task)
+    
+    async def _verify(self, payment_hash: str) -> Dict[str, Any]:
+        """Single /verify round-trip to the facilitator"""
         try:
             response = await self.client.post(
-                f"{self.facilitator_url}/verify",
-                json={"payment_hash": payment_hash}
+                "/verify",
+                content=orjson.dumps({"payment_hash": payment_hash}),
+                headers=_JSON_HEADERS
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"Payment verified: {payment_hash[:16]}...")
+            if response.is_success:
+                data = orjson.loads(response.content)
+                # Args, not an f-string: loguru only formats when a sink takes the level
+                logger.info("Payment verified: {:.16}...", payment_hash)
                 return {
                     "verified": True,
                     "payment_hash": payment_hash,
@@ -43,14 +101,14 @@ class PaymentService:
                     "data": data
                 }
             else:
-                logger.warning(f"Payment verification failed: {response.status_code}")
+                logger.warning("Payment verification failed: {}", response.status_code)
                 return {
                     "verified": False,
                     "payment_hash": payment_hash,
                     "error": f"Verification failed with status {response.status_code}"
                 }
                 
-        except Exception as e:
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logger.error(f"Payment verification error: {str(e)}")
             return {
                 "verified": False,
@@ -73,18 +131,26 @@ class PaymentService:
         Returns:
             Settlement result
         """
+        if not _PLAUSIBLE_HASH.fullmatch(payment_hash):
+            return {
+                "settled": False,
+                "payment_hash": payment_hash,
+                "error": _MALFORMED_HASH
+            }
+        self._require_client()
         try:
             response = await self.client.post(
-                f"{self.facilitator_url}/settle",
-                json={
+                "/settle",
+                content=orjson.dumps({
                     "payment_hash": payment_hash,
                     "amount": amount
-                }
+                }),
+                headers=_JSON_HEADERS
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"Payment settled: {payment_hash[:16]}...")
+            if response.is_success:
+                data = orjson.loads(response.content)
+                logger.info("Payment settled: {:.16}...", payment_hash)
                 return {
                     "settled": True,
                     "payment_hash": payment_hash,
@@ -92,14 +158,14 @@ class PaymentService:
                     "data": data
                 }
             else:
-                logger.warning(f"Payment settlement failed: {response.status_code}")
+                logger.warning("Payment settlement failed: {}", response.status_code)
                 return {
                     "settled": False,
                     "payment_hash": payment_hash,
                     "error": f"Settlement failed with status {response.status_code}"
                 }
                 
-        except Exception as e:
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logger.error(f"Payment settlement error: {str(e)}")
             return {
                 "settled": False,
@@ -107,6 +173,11 @@ class PaymentService:
                 "error": str(e)
             }
     
+    def _require_client(self):
+        """Fail fast if a payment call arrives before initialize()"""
+        if self.client is None:
+            raise RuntimeError("PaymentService not initialized")
+    
     def get_payment_headers(self, endpoint: str) -> Dict[str, str]:
         """
         Generate payment headers for X402 protocol
@@ -117,14 +188,7 @@ class PaymentService:
         Returns:
             Headers dictionary with payment requirements
         """
-        return {
-            "X-Accepts-Payment": "true",
-            "X-Payment-Required": "true",
-            "X-Payment-Amount": str(self.price_per_request),
-            "X-Payment-Currency": "USD",
-            "X-Payment-Facilitator": self.facilitator_url,
-            "X-Payment-Endpoint": endpoint
-        }
+        return {**self._base_headers, "X-Payment-Endpoint": endpoint}
     
     async def close(self):
         """Close HTTP client"""
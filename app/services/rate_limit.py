@@ -0,0 +1,148 @@
+"""
+Client-side throttling and retries for upstream API calls
+Caps in-flight requests and request rate, and pauses when the provider says so
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from aiolimiter import AsyncLimiter
+from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_random_exponential,
+)
+import httpx
+
+# Statuses worth another attempt; anything else (401, 404, ...) is final
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Jittered so concurrent callers hit by the same 429 don't retry in lockstep
+_backoff = wait_random_exponential(multiplier=0.5, max=10)
+
+
+class RateLimiter:
+    """Semaphore + token bucket, honouring X-RateLimit-Remaining/Reset headers"""
+
+    def __init__(self, concurrency: int, max_rate: float, time_period: float = 1.0):
+        self._sem = asyncio.Semaphore(concurrency)
+        self._bucket = AsyncLimiter(max_rate=max_rate, time_period=time_period)
+        self._paused_until = 0.0
+
+    async def __aenter__(self):
+        await self._sem.acquire()
+        try:
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._bucket.acquire()
+        except BaseException:
+            self._sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._sem.release()
+
+    def update(self, response: httpx.Response):
+        """Hold further requests until the window resets once the quota is spent"""
+        exhausted = response.headers.get("X-RateLimit-Remaining") == "0"
+        if not exhausted and response.status_code != 429:
+            return
+
+        reset = self._reset_delay(response.headers.get("X-RateLimit-Reset"))
+        if reset:
+            self._paused_until = max(self._paused_until, time.monotonic() + reset)
+            logger.warning(f"Upstream rate limit reached, pausing requests for {reset:.1f}s")
+
+    @staticmethod
+    def _reset_delay(value: Optional[str]) -> float:
+        """Seconds until reset; providers send either a delta or an epoch timestamp"""
+        try:
+            reset = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+        if reset > 1e9:
+            reset -= time.time()
+        return max(0.0, min(reset, 60.0))
+
+
+class RetryableStatus(Exception):
+    """Raised inside the retry loop for a response in RETRY_STATUSES"""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After in seconds, when the server sent one as a number"""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Honour the server's Retry-After, otherwise back off with jitter"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, RetryableStatus):
+        delay = _retry_after(exc.response)
+        if delay is not None:
+            return min(delay, 10.0)
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState):
+    logger.warning(
+        f"Retrying {retry_state.args[1]} after {retry_state.outcome.exception()} "
+        f"(attempt {retry_state.attempt_number})"
+    )
+
+
+def _give_up(retry_state: RetryCallState) -> httpx.Response:
+    """Out of attempts: hand back the last response, or re-raise the transport error"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, RetryableStatus):
+        return exc.response
+    raise exc
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, Any],
+    limiter: RateLimiter
+) -> httpx.Response:
+    async with limiter:
+        response = await client.get(url, params=params)
+    limiter.update(response)
+    if response.status_code in RETRY_STATUSES:
+        raise RetryableStatus(response)
+    return response
+
+
+async def get_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, Any],
+    limiter: RateLimiter
+) -> httpx.Response:
+    """
+    GET with throttling, retrying only transport errors and 429/5xx
+
+    Each retry re-sends just the request, not the caller's parsing. Total
+    time is capped at 20s.
+    """
+    retrying = AsyncRetrying(
+        retry=retry_if_exception_type((httpx.TransportError, RetryableStatus)),
+        wait=_wait,
+        stop=stop_after_attempt(3) | stop_after_delay(20),
+        before_sleep=_log_retry,
+        retry_error_callback=_give_up
+    )
+    return await retrying(_send, client, url, params, limiter)
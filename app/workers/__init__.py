@@ -3,5 +3,6 @@ Workers module - Scheduled background workers
 """
 
 from app.workers.cleanup import CleanupWorker, cleanup_worker
+from app.workers.cache_warmer import CacheWarmer, cache_warmer
 
-__all__ = ["CleanupWorker", "cleanup_worker"]
\ No newline at end of file
+__all__ = ["CleanupWorker", "cleanup_worker", "CacheWarmer", "cache_warmer"]
\ No newline at end of file
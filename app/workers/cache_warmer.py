@@ -0,0 +1,56 @@
+"""
+Cache Warmer - Scheduled job to refresh market caches before they expire
+"""
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.cache.redis_client import redis_client
+from app.controllers.markets_controller import MarketsController
+from app.core.config import settings
+from loguru import logger
+
+
+class CacheWarmer:
+    """Worker that pre-warms all market endpoint caches"""
+    
+    LEADER_KEY = "markets:warmer:leader"
+    
+    def __init__(self):
+        self.scheduler = AsyncIOScheduler()
+        # Refresh a minute before entries expire
+        self.interval = max(60, settings.REDIS_TTL - 60)
+    
+    def start(self):
+        """Start the warmer scheduler"""
+        self.scheduler.add_job(
+            self.warm,
+            'interval',
+            seconds=self.interval,
+            id='warm_market_caches',
+            name='Refresh market endpoint caches',
+            replace_existing=True
+        )
+        
+        self.scheduler.start()
+        logger.info("✓ Cache warmer started successfully")
+    
+    def stop(self):
+        """Stop the warmer scheduler"""
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+            logger.info("Cache warmer stopped")
+    
+    async def warm(self):
+        """Refresh all market caches if this worker is the leader for this interval"""
+        # The lock expires just before the next run, so every tick re-elects
+        # a single worker across the deployment
+        if not await redis_client.acquire_lock(self.LEADER_KEY, ttl=self.interval - 5):
+            return
+        
+        try:
+            await MarketsController.refresh_all_markets()
+            logger.info("Refreshed market caches")
+        except Exception as e:
+            logger.error(f"Error warming market caches: {str(e)}")
+
+
+cache_warmer = CacheWarmer()
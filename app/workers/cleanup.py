@@ -3,30 +3,41 @@ Cleanup Worker - Scheduled job to remove old data
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.database.session import AsyncSessionLocal
+from app.cache.redis_client import redis_client
+from app.database.maintenance import delete_in_batches
 from app.models.news import SignalItem, CategoryFeed
 from app.models.payment import PaymentTransaction
 from datetime import datetime, timedelta
 from loguru import logger
+import asyncio
 import time
 
+# Seconds of deleting per table per run; whatever is left waits for the next hour
+_TIME_BUDGET = 60.0
+
 
 class CleanupWorker:
     """Worker for cleaning up old data from database"""
     
+    LEADER_KEY = "cleanup:leader"
+    INTERVAL = 3600
+    
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
     
     def start(self):
         """Start the cleanup scheduler"""
-        # Run cleanup every hour
+        # Run cleanup every hour, as a coroutine on the app's event loop; a
+        # run that is still deleting is never joined by a second one
         self.scheduler.add_job(
             self.cleanup_old_data,
             'interval',
-            hours=1,
+            seconds=self.INTERVAL,
             id='cleanup_old_data',
             name='Cleanup old database records',
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
         
         self.scheduler.start()
@@ -38,44 +49,47 @@ class CleanupWorker:
             self.scheduler.shutdown()
             logger.info("Cleanup worker stopped")
     
-    @staticmethod
-    def cleanup_old_data():
-        """Delete data older than 24 hours"""
-        db = AsyncSessionLocal()
+    async def cleanup_old_data(self):
+        """Delete data older than 24 hours, in batches, if this worker is the leader"""
+        # Every API process runs this scheduler; the lock expires just before
+        # the next run, so each hour a single worker does the deleting
+        if not await redis_client.acquire_lock(self.LEADER_KEY, ttl=self.INTERVAL - 5):
+            return
+        
         try:
             # Calculate cutoff times
             cutoff_datetime = datetime.utcnow() - timedelta(hours=24)
             cutoff_timestamp = time.time() - (24 * 3600)
             
-            # Delete old signal items (by timestamp)
-            deleted_signals = db.query(SignalItem).filter(
-                SignalItem.timestamp < cutoff_timestamp
-            ).delete()
-            
-            # Delete old category feeds (by last_updated)
-            deleted_feeds = db.query(CategoryFeed).filter(
-                CategoryFeed.last_updated < cutoff_timestamp
-            ).delete()
-            
-            # Delete old payment transactions (by created_at)
-            deleted_payments = db.query(PaymentTransaction).filter(
-                PaymentTransaction.created_at < cutoff_datetime
-            ).delete()
-            
-            db.commit()
+            # Tables are independent; each batch loop takes its own pooled
+            # session, so the three run concurrently instead of back to back
+            deleted_signals, deleted_feeds, deleted_payments = await asyncio.gather(
+                # Old signal items (by timestamp)
+                delete_in_batches(
+                    SignalItem, SignalItem.timestamp < cutoff_timestamp,
+                    time_budget=_TIME_BUDGET, order_by=SignalItem.timestamp
+                ),
+                # Old category feeds (by last_updated)
+                delete_in_batches(
+                    CategoryFeed, CategoryFeed.last_updated < cutoff_timestamp,
+                    time_budget=_TIME_BUDGET, order_by=CategoryFeed.last_updated
+                ),
+                # Old payment transactions (by created_at)
+                delete_in_batches(
+                    PaymentTransaction, PaymentTransaction.created_at < cutoff_datetime,
+                    time_budget=_TIME_BUDGET, order_by=PaymentTransaction.created_at
+                )
+            )
             
             if deleted_signals > 0 or deleted_feeds > 0 or deleted_payments > 0:
                 logger.info(
-                    f"Cleaned up {deleted_signals} signal items, "
-                    f"{deleted_feeds} category feeds, and "
-                    f"{deleted_payments} payment records older than 24 hours"
+                    "Cleaned up {} signal items, {} category feeds, and "
+                    "{} payment records older than 24 hours",
+                    deleted_signals, deleted_feeds, deleted_payments
                 )
             
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
-            db.rollback()
-        finally:
-            db.close()
 
 
 cleanup_worker = CleanupWorker()
\ No newline at end of file
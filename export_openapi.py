@@ -4,23 +4,65 @@ Export OpenAPI schema from FastAPI app to JSON file.
 Usage:
     uv run export_openapi.py
     uv run export_openapi.py --output openapi.yaml
+    uv run export_openapi.py --no-cache
 """
 
 import argparse
-import json
+import hashlib
+import importlib
 import sys
+from importlib import metadata
 from pathlib import Path
 
+import orjson
 import yaml
 
+# libyaml's C dumper when available; the pure-Python one is much slower
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
-def export_openapi(app_import: str, output_file: str = "openapi.json"):
+CACHE_DIR = Path(".openapi_cache")
+
+
+def _schema_key(app, module) -> str:
+    """
+    Hash of everything the generated schema depends on
+    
+    Route signatures, the app's title/version, the FastAPI and Pydantic
+    versions, and the source of the app's package, so a model change
+    invalidates the cache even when no route changed.
+    """
+    digest = hashlib.sha256()
+    for dist in ("fastapi", "pydantic"):
+        try:
+            digest.update(f"{dist}={metadata.version(dist)};".encode())
+        except metadata.PackageNotFoundError:
+            pass
+    digest.update(f"{app.title};{app.version};{app.openapi_version};".encode())
+    
+    for route in app.routes:
+        endpoint = getattr(route, "endpoint", None)
+        methods = sorted(getattr(route, "methods", None) or ())
+        digest.update(
+            f"{getattr(route, 'path', '')}|{methods}|{getattr(endpoint, '__qualname__', '')};".encode()
+        )
+    
+    top = sys.modules[module.__name__.partition(".")[0]]
+    source = Path(top.__file__)
+    files = sorted(source.parent.rglob("*.py")) if source.name == "__init__.py" else [source]
+    for path in files:
+        digest.update(path.read_bytes())
+    
+    return digest.hexdigest()
+
+
+def export_openapi(app_import: str, output_file: str = "openapi.json", use_cache: bool = True):
     """
     Export OpenAPI schema from a FastAPI app.
     
     Args:
         app_import: Import path to the FastAPI app (e.g., "main:app")
         output_file: Output file path (supports .json or .yaml)
+        use_cache: Reuse a schema cached by an earlier run with the same inputs
     """
     # Split the import string
     try:
@@ -31,13 +73,11 @@ def export_openapi(app_import: str, output_file: str = "openapi.json"):
         print("Example: 'main:app' or 'app.main:application'")
         sys.exit(1)
     
-    # Import the FastAPI app
+    # Import the FastAPI app. The script sits at the repo root, which Python
+    # already puts on sys.path. Startup hooks (DB, schedulers, HTTP clients)
+    # only run on server startup, never on import or app.openapi().
     try:
-        # Add current directory to path
-        sys.path.insert(0, str(Path.cwd()))
-        
-        # Import the module
-        module = __import__(module_path, fromlist=[app_name])
+        module = importlib.import_module(module_path)
         app = getattr(module, app_name)
     except ImportError as e:
         print(f"Error: Could not import module '{module_path}'")
@@ -47,9 +87,17 @@ def export_openapi(app_import: str, output_file: str = "openapi.json"):
         print(f"Error: Could not find '{app_name}' in module '{module_path}'")
         sys.exit(1)
     
-    # Generate OpenAPI schema
+    # Generate OpenAPI schema, or load it from the cache
+    cache_path = CACHE_DIR / f"{_schema_key(app, module)}.json" if use_cache else None
     try:
-        openapi_schema = app.openapi()
+        if cache_path is not None and cache_path.exists():
+            openapi_schema = orjson.loads(cache_path.read_bytes())
+            print(f"Using cached OpenAPI schema {cache_path}")
+        else:
+            openapi_schema = app.openapi()
+            if cache_path is not None:
+                CACHE_DIR.mkdir(exist_ok=True)
+                cache_path.write_bytes(orjson.dumps(openapi_schema))
     except Exception as e:
         print(f"Error generating OpenAPI schema: {e}")
         sys.exit(1)
@@ -60,11 +108,16 @@ def export_openapi(app_import: str, output_file: str = "openapi.json"):
     try:
         if output_path.suffix == ".yaml" or output_path.suffix == ".yml":
             with open(output_path, "w") as f:
-                yaml.dump(openapi_schema, f, sort_keys=False, default_flow_style=False)
+                yaml.dump(
+                    openapi_schema,
+                    f,
+                    Dumper=_YAML_DUMPER,
+                    sort_keys=False,
+                    default_flow_style=False
+                )
             print(f"✅ OpenAPI schema exported to {output_file} (YAML)")
         else:
-            with open(output_path, "w") as f:
-                json.dump(openapi_schema, f, indent=2)
+            output_path.write_bytes(orjson.dumps(openapi_schema, option=orjson.OPT_INDENT_2))
             print(f"✅ OpenAPI schema exported to {output_file} (JSON)")
     except Exception as e:
         print(f"Error writing file: {e}")
@@ -78,8 +131,8 @@ def main():
     parser.add_argument(
         "app",
         nargs="?",
-        default="main:app",
-        help="App import string (default: main:app)",
+        default="app.main:app",
+        help="App import string (default: app.main:app)",
     )
     parser.add_argument(
         "-o",
@@ -87,9 +140,14 @@ def main():
         default="openapi.json",
         help="Output file path (default: openapi.json)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate the schema instead of using .openapi_cache",
+    )
     
     args = parser.parse_args()
-    export_openapi(args.app, args.output)
+    export_openapi(args.app, args.output, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":